@@ -13,6 +13,24 @@ import re
 from typing import Optional, Dict, Any, Callable, AsyncGenerator
 from pydantic import BaseModel, Field
 
+try:
+    import orjson  # Optional: faster parsing of string payloads
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson not installed in this Open WebUI
+    _json_loads = json.loads
+
+# Keyword categories for error type detection, compiled once at import time
+_SCANNER_INVALID_RE = re.compile(
+    r"content policy|safety guidelines|guardrails|content blocked"
+    r"|scanner|invalid|block|unsafe|unavailable for legal reasons",
+    re.IGNORECASE,
+)
+_INAPPROPRIATE_RE = re.compile(r"inappropriate", re.IGNORECASE)
+_THREAT_RE = re.compile(r"threat|security|malicious", re.IGNORECASE)
+_TIMEOUT_RE = re.compile(r"timeout|timed out", re.IGNORECASE)
+# Keywords that, together with "451", mark a string as a content policy error
+_HTTP_451_KEYWORDS_RE = re.compile(r"unavailable|legal|blocked|content policy", re.IGNORECASE)
+
 
 class Filter:
     """HTTP 451 Content Policy Error Handler - Only processes content blocked by guardrails"""
@@ -37,21 +55,26 @@ class Filter:
             "timeout": "⏱️ **Timeout Error**: Request timed out.",
             "generic": self.valves.default_error_msg
         }
+        # Formatted messages for the last-seen error_format (rebuilt when it changes)
+        self._formatted_format: Optional[str] = None
+        self._formatted_messages: Dict[str, str] = {}
 
     def _safe_get(self, obj: Any, key: str, default: Any = None) -> Any:
         """Safely get attribute from object, handling both dict and string cases."""
+        obj_type = type(obj)
+        if obj_type is dict:
+            return obj.get(key, default)
         if obj is None:
             return default
-        if hasattr(obj, 'get') and callable(getattr(obj, 'get')):
-            return obj.get(key, default)
         if isinstance(obj, str):
             try:
-                parsed = json.loads(obj)
-                if isinstance(parsed, dict):
-                    return parsed.get(key, default)
-            except (json.JSONDecodeError, ValueError):
-                pass
-            return default
+                parsed = _json_loads(obj)
+            except ValueError:  # json/orjson JSONDecodeError are ValueError subclasses
+                return default
+            return parsed.get(key, default) if type(parsed) is dict else default
+        getter = getattr(obj, 'get', None)
+        if callable(getter):
+            return getter(key, default)
         try:
             return getattr(obj, key, default)
         except (AttributeError, TypeError):
@@ -61,7 +84,29 @@ class Filter:
         """Check if the object represents an HTTP 451 error."""
         if obj is None:
             return False
-        
+
+        # Strings: cheap substring checks before any JSON parsing. A JSON body can
+        # only carry a 451 status or the policy error type if it contains them.
+        if isinstance(obj, str):
+            if "451" in obj:
+                if _HTTP_451_KEYWORDS_RE.search(obj):
+                    return True
+            elif "content_policy_violation" not in obj:
+                return False
+            try:
+                obj = _json_loads(obj)
+            except ValueError:  # json/orjson JSONDecodeError are ValueError subclasses
+                return False
+            if type(obj) is not dict:
+                return False
+
+        # Fast path: stream/outlet payloads are almost always plain dicts
+        if type(obj) is dict:
+            if obj.get('status_code') == 451 or obj.get('status') == 451:
+                return True
+            error_type = obj.get('X-Error-Type') or obj.get('error_type')
+            return error_type == "content_policy_violation"
+
         # Check for explicit status_code field
         status_code = self._safe_get(obj, 'status_code')
         if status_code == 451:
@@ -72,12 +117,6 @@ class Filter:
         if status == 451:
             return True
         
-        # Check if it's a string representation of 451 error
-        if isinstance(obj, str):
-            # Look for "451" in the string content
-            if "451" in obj and any(keyword in obj.lower() for keyword in ["unavailable", "legal", "blocked", "content policy"]):
-                return True
-        
         # Check for error type indicators in headers or error details
         error_type = self._safe_get(obj, 'X-Error-Type') or self._safe_get(obj, 'error_type')
         if error_type == "content_policy_violation":
@@ -89,27 +128,36 @@ class Filter:
         """Detect error type based on message content - optimized for HTTP 451 content policy violations"""
         if not message:
             return "generic"
-        message_lower = message.lower()
         
         # Check for specific HTTP 451 / content policy violation indicators
-        if any(word in message_lower for word in ["content policy", "safety guidelines", "guardrails", "content blocked"]):
+        if _SCANNER_INVALID_RE.search(message):
             return "scanner_invalid"
-        if any(word in message_lower for word in ["scanner", "invalid", "block", "unsafe", "unavailable for legal reasons"]):
-            return "scanner_invalid"
-        if "inappropriate" in message_lower:
+        if _INAPPROPRIATE_RE.search(message):
             return "inappropriate"
-        if any(word in message_lower for word in ["threat", "security", "malicious"]):
+        if _THREAT_RE.search(message):
             return "threat_detected"
-        if any(word in message_lower for word in ["timeout", "timed out"]):
+        if _TIMEOUT_RE.search(message):
             return "timeout"
         return "generic"
 
     def _format_error_message(self, error_type: str) -> str:
         """Format error message based on configuration"""
-        base_message = self.error_messages.get(error_type, self.error_messages["generic"])
-        if self.valves.error_format == "html":
+        error_format = self.valves.error_format
+        if error_format != self._formatted_format:
+            self._formatted_messages = {
+                key: self._render_error_message(message, error_format)
+                for key, message in self.error_messages.items()
+            }
+            self._formatted_format = error_format
+        formatted = self._formatted_messages
+        return formatted.get(error_type, formatted["generic"])
+
+    @staticmethod
+    def _render_error_message(base_message: str, error_format: str) -> str:
+        """Wrap a base message in the markup for the given error format"""
+        if error_format == "html":
             return f'<div style="color: #dc3545; padding: 10px;">{base_message}</div>'
-        elif self.valves.error_format == "plain":
+        elif error_format == "plain":
             return f"ERROR: {base_message}"
         else:
             return f"> {base_message}"
@@ -141,7 +189,7 @@ class Filter:
             
         except Exception as e:
             if self.valves.debug_mode and __event_emitter__:
-                __event_emitter__({"type": "status", "data": {"description": f"Error processing HTTP 451: {str(e)}"}})
+                __event_emitter__({"type": "status", "data": {"description": f"Error processing HTTP 451: {e}"}})
 
         return body
 
@@ -151,12 +199,14 @@ class Filter:
             yield event
             return
 
+        debug = self.valves.debug_mode
         try:
+            event_type = event.get('type')
             # Check if this is an HTTP 451 error event
-            if event.get('type') == 'error':
+            if event_type == 'error':
                 data = self._safe_get(event, 'data', event)
                 if self._is_http_451_error(data):
-                    if self.valves.debug_mode:
+                    if debug:
                         yield {"type": "status", "data": {"description": "HTTP 451 error detected in stream"}}
                     
                     error_msg = self._safe_get(data, 'error') or self._safe_get(data, 'detail') or str(data)
@@ -174,16 +224,17 @@ class Filter:
                     return
             
             # Check for HTTP 451 errors in message content
-            elif event.get('type') == 'message':
-                data = self._safe_get(event, 'data', {})
+            elif event_type == 'message':
+                # No per-event ``{}`` default: _safe_get(None, ...) already yields ''
+                data = self._safe_get(event, 'data')
                 content = self._safe_get(data, 'content', '')
                 
                 # Only process if the content suggests an HTTP 451 error
-                if content and "451" in content and any(word in content.lower() for word in ['unavailable', 'blocked', 'legal', 'content policy']):
+                if content and "451" in content and _HTTP_451_KEYWORDS_RE.search(content):
                     error_type = self._detect_error_type(content)
                     formatted_message = self._format_error_message(error_type)
                     
-                    if self.valves.debug_mode:
+                    if debug:
                         yield {"type": "status", "data": {"description": f"HTTP 451 content detected, formatted as {error_type}"}}
                     
                     yield {
@@ -197,8 +248,8 @@ class Filter:
                     return
                     
         except Exception as e:
-            if self.valves.debug_mode:
-                yield {"type": "status", "data": {"description": f"Stream HTTP 451 processing error: {str(e)}"}}
+            if debug:
+                yield {"type": "status", "data": {"description": f"Stream HTTP 451 processing error: {e}"}}
 
         # Pass through all non-451 events unchanged
         yield event
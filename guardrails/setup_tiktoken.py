@@ -14,8 +14,36 @@ Usage:
 import sys
 import os
 import argparse
+import asyncio
+import heapq
+import importlib.util
 from pathlib import Path
 
+
+async def _download_all(download, names, cache_dir, max_workers):
+    """Run blocking ``download(name, cache_dir, configure_env=False)`` calls concurrently.
+
+    Downloads are network-bound, so running them on worker threads overlaps
+    connection setup and transfer time. The caller configures offline mode
+    once beforehand, so the workers never write ``os.environ``. Results are
+    returned in input order.
+    """
+    semaphore = asyncio.Semaphore(max(1, min(max_workers, len(names))))
+
+    async def _download(name):
+        async with semaphore:
+            return await asyncio.to_thread(download, name, cache_dir, configure_env=False)
+
+    return await asyncio.gather(*(_download(name) for name in names))
+
+
+def _report_downloads(names, results):
+    """Print per-item download results and return the success count."""
+    for i, (name, ok) in enumerate(zip(names, results), 1):
+        print(f"  [{i}/{len(names)}] {name}... {'✓' if ok else '✗'}")
+    return sum(1 for ok in results if ok)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Setup tiktoken and Hugging Face offline modes with local cache",
@@ -27,6 +55,7 @@ Examples:
   python setup_tiktoken.py -e cl100k_base p50k_base
   python setup_tiktoken.py --models bert-base-uncased
   python setup_tiktoken.py -e cl100k_base --models bert-base-uncased
+  python setup_tiktoken.py --models bert-base-uncased roberta-base -j 4
   python setup_tiktoken.py --help
         """
     )
@@ -52,6 +81,13 @@ Examples:
         help="Hugging Face models to download (e.g., bert-base-uncased sentence-transformers/all-mpnet-base-v2)"
     )
     
+    parser.add_argument(
+        "-j", "--max-workers",
+        type=int,
+        default=8,
+        help="Maximum number of concurrent downloads (default: 8)"
+    )
+    
     parser.add_argument(
         "-v", "--verbose",
         action="store_true",
@@ -85,6 +121,12 @@ Examples:
     if guardrails_src.exists():
         sys.path.insert(0, str(guardrails_src.parent))
     
+    # Use the parallel-chunk Rust downloader for model files when available.
+    # huggingface_hub refuses to download if the flag is set without the
+    # package installed, so only enable it when hf_transfer can be imported.
+    if importlib.util.find_spec("hf_transfer") is not None:
+        os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+    
     try:
         from ollama_guardrails.utils.tiktoken_cache import (
             setup_tiktoken_offline_mode,
@@ -119,14 +161,10 @@ Examples:
         print("✓ Offline mode configured\n")
         
         print("Downloading encodings...")
-        success_count = 0
-        for i, encoding in enumerate(args.encodings, 1):
-            print(f"  [{i}/{len(args.encodings)}] {encoding}...", end=" ", flush=True)
-            if download_tiktoken_encoding(encoding, tiktoken_cache):
-                print("✓")
-                success_count += 1
-            else:
-                print("✗")
+        results = asyncio.run(_download_all(
+            download_tiktoken_encoding, args.encodings, tiktoken_cache, args.max_workers
+        ))
+        success_count = _report_downloads(args.encodings, results)
         
         print()
         
@@ -142,7 +180,7 @@ Examples:
         print(f"  Size: {info['cache_size_mb']:.2f} MB")
         print(f"  Files: {len(info['cached_files'])}")
         if info['cached_files']:
-            for filename in sorted(info['cached_files'])[:5]:
+            for filename in heapq.nsmallest(5, info['cached_files']):
                 print(f"    - {filename}")
             if len(info['cached_files']) > 5:
                 print(f"    ... and {len(info['cached_files']) - 5} more files")
@@ -164,14 +202,10 @@ Examples:
         
         if args.models:
             print("Downloading models...")
-            success_count = 0
-            for i, model_id in enumerate(args.models, 1):
-                print(f"  [{i}/{len(args.models)}] {model_id}...", end=" ", flush=True)
-                if download_huggingface_model(model_id, hf_cache):
-                    print("✓")
-                    success_count += 1
-                else:
-                    print("✗")
+            results = asyncio.run(_download_all(
+                download_huggingface_model, args.models, hf_cache, args.max_workers
+            ))
+            success_count = _report_downloads(args.models, results)
             
             print()
             
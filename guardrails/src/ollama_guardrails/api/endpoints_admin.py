@@ -5,15 +5,52 @@ This module contains administrative endpoints:
 - Health check (/health)
 - Configuration (/config)
 - Statistics (/stats)
+- Combined snapshot of all three (/admin/snapshot)
 """
 
-from datetime import datetime
+import time
+import zlib
 
-from fastapi import APIRouter
+import orjson
+from fastapi import APIRouter, Response
 
 # Create router
 router = APIRouter()
 
+# Seconds a rendered /health body is reused
+_HEALTH_CACHE_TTL = 1.0
+# Lets reverse proxies and sidecars coalesce probes for the same window
+_HEALTH_CACHE_CONTROL = f"max-age={int(_HEALTH_CACHE_TTL)}, public"
+
+# (epoch second, ISO-8601 string) of the last rendered timestamp
+_timestamp_cache = (0, "")
+
+
+def _timestamp() -> str:
+    """Return the current local time as ISO-8601, formatted at most once per second."""
+    global _timestamp_cache
+    now = int(time.time())
+    if now != _timestamp_cache[0]:
+        # Same output as datetime.fromtimestamp(now).isoformat() for whole seconds
+        _timestamp_cache = (now, time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(now)))
+    return _timestamp_cache[1]
+
+
+def _etag_matches(if_none_match, etag: str) -> bool:
+    """Weak If-None-Match comparison: a comma-separated list of tags or ``*``."""
+    if not if_none_match:
+        return False
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
 
 def create_admin_endpoints(config, guard_manager):
     """
@@ -23,56 +60,128 @@ def create_admin_endpoints(config, guard_manager):
         config: Configuration object
         guard_manager: LLM Guard manager instance
     """
-    
-    @router.get("/health")
-    async def health_check():
-        """Health check endpoint."""
+    # The device and memory-stats hook are fixed once the manager is built.
+    # The guard flags are not (a failed lazy scanner load disables them), so
+    # the handlers keep reading those per request.
+    device = getattr(guard_manager, 'device', None)
+    get_device_memory_stats = getattr(guard_manager, 'get_device_memory_stats', None)
+
+    # /health is polled by liveness probes; serve the rendered body for up to
+    # _HEALTH_CACHE_TTL seconds instead of rebuilding it on every hit.
+    health_cache = {"expires": 0.0, "body": b"", "etag": ""}
+
+    async def health_check(request):
+        """Health check endpoint.
+
+        Registered as a plain Starlette route (no FastAPI dependency solving
+        or response validation) and bypassed by ProxyRequestMiddleware:
+        responses carry no Via header and are never access-logged.
+        """
+        now = time.monotonic()
+        if now >= health_cache["expires"]:
+            _render_health(now)
+
+        # Probes that send the last ETag get an empty 304 instead of the body
+        headers = {"ETag": health_cache["etag"], "Cache-Control": _HEALTH_CACHE_CONTROL}
+        if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        return Response(content=health_cache["body"], media_type="application/json", headers=headers)
+
+    def _render_health(now):
+        """Rebuild the cached /health body and its ETag."""
+        # Guard flags may flip at runtime (e.g. llm_guard failing to load), so
+        # they are re-read whenever the cached body expires.
+        input_enabled = getattr(guard_manager, 'enable_input', False)
+        output_enabled = getattr(guard_manager, 'enable_output', False)
+
         health_data = {
             "status": "healthy",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _timestamp(),
             "guards": {
-                "input_guard": "enabled" if getattr(guard_manager, 'enable_input', False) else "disabled",
-                "output_guard": "enabled" if getattr(guard_manager, 'enable_output', False) else "disabled",
+                "input_guard": "enabled" if input_enabled else "disabled",
+                "output_guard": "enabled" if output_enabled else "disabled",
             },
         }
         
         # Add device information
-        if hasattr(guard_manager, 'device'):
-            health_data['device'] = guard_manager.device
-        
-        return health_data
+        if device is not None:
+            health_data['device'] = device
+
+        # The ETag covers everything but the timestamp, so it only changes
+        # when the reported state does rather than every second
+        state = orjson.dumps({k: v for k, v in health_data.items() if k != "timestamp"})
+        health_cache["body"] = orjson.dumps(health_data)
+        health_cache["etag"] = 'W/"%08x"' % zlib.crc32(state)
+        health_cache["expires"] = now + _HEALTH_CACHE_TTL
+
+    router.add_route("/health", health_check, methods=["GET"])
+
+    # Configuration values are fixed for the lifetime of the process, so the
+    # /config payload is rendered once.
+    safe_config = {
+        'ollama_url': config.get('ollama_url'),
+        'ollama_path': config.get('ollama_path'),
+        'proxy_host': config.get('proxy_host'),
+        'proxy_port': config.get('proxy_port'),
+        'enable_input_guard': config.get('enable_input_guard', True),
+        'enable_output_guard': config.get('enable_output_guard', True),
+        'block_on_guard_error': config.get('block_on_guard_error', False),
+    }
+    
+    # Add device info
+    if device is not None:
+        safe_config['device'] = device
+    safe_config_body = orjson.dumps(safe_config)
 
     @router.get("/config")
     async def get_config():
         """Get current configuration (non-sensitive)."""
-        safe_config = {
-            'ollama_url': config.get('ollama_url'),
-            'ollama_path': config.get('ollama_path'),
-            'proxy_host': config.get('proxy_host'),
-            'proxy_port': config.get('proxy_port'),
-            'enable_input_guard': config.get('enable_input_guard'),
-            'enable_output_guard': config.get('enable_output_guard'),
-            'block_on_guard_error': config.get('block_on_guard_error'),
-        }
+        return Response(content=safe_config_body, media_type="application/json")
+
+    # /stats payload template: the dynamic fields are overwritten in place on
+    # each request. Safe without a copy because the handler serializes it
+    # before yielding to the event loop.
+    stats_guards = {
+        "input_enabled": False,
+        "output_enabled": False,
+        "device": device if device is not None else 'unknown',
+    }
+    stats = {"timestamp": "", "guards": stats_guards}
+
+    def _render_stats() -> bytes:
+        """Refresh the /stats template and serialize it."""
+        stats["timestamp"] = _timestamp()
+        stats_guards["input_enabled"] = getattr(guard_manager, 'enable_input', False)
+        stats_guards["output_enabled"] = getattr(guard_manager, 'enable_output', False)
         
-        # Add device info
-        if hasattr(guard_manager, 'device'):
-            safe_config['device'] = guard_manager.device
+        # Apple Silicon: report torch.mps allocator usage
+        device_memory = get_device_memory_stats() if get_device_memory_stats is not None else None
+        if device_memory:
+            stats_guards["device_memory"] = device_memory
+        else:
+            stats_guards.pop("device_memory", None)
         
-        return safe_config
+        return orjson.dumps(stats)
 
     @router.get("/stats")
     async def get_stats():
         """Get guard statistics."""
-        stats = {
-            "timestamp": datetime.now().isoformat(),
-            "guards": {
-                "input_enabled": getattr(guard_manager, 'enable_input', False),
-                "output_enabled": getattr(guard_manager, 'enable_output', False),
-                "device": getattr(guard_manager, 'device', 'unknown'),
-            },
-        }
-        
-        return stats
+        # Serialize directly; returning the dict would walk it through jsonable_encoder
+        return Response(content=_render_stats(), media_type="application/json")
+
+    @router.get("/admin/snapshot")
+    async def get_snapshot():
+        """Get /health, /config and /stats payloads in a single response."""
+        now = time.monotonic()
+        if now >= health_cache["expires"]:
+            _render_health(now)
+        # Splice the already-serialized bodies instead of re-encoding them
+        body = b"".join((
+            b'{"health":', health_cache["body"],
+            b',"config":', safe_config_body,
+            b',"stats":', _render_stats(),
+            b"}",
+        ))
+        return Response(content=body, media_type="application/json")
     
     return router
@@ -12,10 +12,17 @@ import json
 import logging
 from typing import Optional, Dict, Any
 
+import orjson
 from fastapi import APIRouter, Request, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse
-
-from ..middleware.http_client import forward_request, safe_json, get_http_client
+from fastapi.responses import ORJSONResponse, StreamingResponse, PlainTextResponse, Response
+
+from ..middleware.http_client import (
+    forward_request,
+    get_http_client,
+    get_inflight_limiter,
+    read_json_body,
+    safe_json,
+)
 from ..utils import (
     extract_model_from_payload,
     extract_text_from_payload,
@@ -33,6 +40,40 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+async def _relay_upstream_stream(resp):
+    """Relay an upstream NDJSON stream (pull/push/create) to the client unchanged.
+
+    Ollama streams these uncompressed, so chunks are forwarded as read from the
+    socket via ``aiter_raw()`` without passing through httpx's decoder chain.
+    These transfers can run for an hour, so they stay outside the in-flight
+    generation limit.
+    """
+    async with resp as response:
+        if response.status_code != 200:
+            raise HTTPException(status_code=response.status_code, detail={"error": "upstream_error"})
+        if response.headers.get("content-encoding"):
+            chunks = response.aiter_bytes()
+        else:
+            chunks = response.aiter_raw()
+        async for chunk in chunks:
+            yield chunk
+
+
+def _relay_upstream_json(resp) -> Response:
+    """Return an upstream JSON body (tags/show/embed/ps/version) without re-encoding it.
+
+    These endpoints are not inspected by the guards, so the bytes are passed
+    through instead of being parsed and serialized again (embeddings can be
+    several MiB of floats). The upstream status is kept, and anything that is
+    not a JSON body is reported as a bad gateway rather than relabelled.
+    """
+    content_type = resp.headers.get("content-type", "")
+    if not resp.content or "json" not in content_type.lower():
+        logger.error("Upstream returned a non-JSON body (content-type %r)", content_type)
+        raise HTTPException(status_code=502, detail={"error": "invalid_upstream_response"})
+    return Response(content=resp.content, status_code=resp.status_code, media_type="application/json")
+
+
 def create_ollama_endpoints(config, guard_manager):
     """
     Create Ollama endpoints with dependency injection.
@@ -46,6 +87,14 @@ def create_ollama_endpoints(config, guard_manager):
     from .streaming_handlers import create_streaming_handlers
     stream_response_with_guard = create_streaming_handlers(config, guard_manager)
 
+    # Upstream targets and guard flags never change at runtime; resolve them once
+    generate_path = config.get('ollama_path', '/api/generate')
+    chat_url = f"{config.get('ollama_url', 'http://127.0.0.1:11434').rstrip('/')}/api/chat"
+    enable_input_guard = config.get('enable_input_guard', True)
+    enable_output_guard = config.get('enable_output_guard', True)
+    block_on_guard_error = config.get('block_on_guard_error', False)
+    inline_guard = inline_guard_errors_enabled(config)
+
     @router.get("/")
     async def healthcheck():
         """Health check endpoint - forwards to Ollama's root endpoint."""
@@ -75,11 +124,11 @@ def create_ollama_endpoints(config, guard_manager):
 
         if is_stream:
             async def _inline_stream():
-                yield json.dumps(payload) + "\n"
+                yield orjson.dumps(payload) + b"\n"
 
             return StreamingResponse(_inline_stream(), media_type="application/x-ndjson")
 
-        return JSONResponse(status_code=200, content=payload)
+        return ORJSONResponse(status_code=200, content=payload)
 
     def _inline_chat_guard_response(
         model_name: Optional[str],
@@ -102,40 +151,35 @@ def create_ollama_endpoints(config, guard_manager):
 
         if is_stream:
             async def _inline_stream():
-                yield json.dumps(payload) + "\n"
+                yield orjson.dumps(payload) + b"\n"
 
             return StreamingResponse(_inline_stream(), media_type="text/event-stream")
 
-        return JSONResponse(status_code=200, content=payload)
+        return ORJSONResponse(status_code=200, content=payload)
     
     @router.post("/api/generate")
     async def proxy_generate(request: Request, background_tasks: BackgroundTasks):
         """Proxy /api/generate with input/output scanning and streaming support."""
-        try:
-            payload = await request.json()
-        except Exception as e:
-            logger.error("Failed to parse request JSON: %s", e)
-            raise HTTPException(status_code=400, detail={"error": "invalid_json", "message": str(e)})
+        payload, _ = await read_json_body(request)
 
         # Extract model and prompt
         model_name = extract_model_from_payload(payload)
         prompt = extract_text_from_payload(payload)
         logger.debug("Incoming /api/generate request: model=%s, prompt length=%d, prompt=%s", model_name, len(prompt) if prompt else 0, prompt)
 
-        detected_lang = LanguageDetector.detect_language(prompt)
-        inline_guard = inline_guard_errors_enabled(config)
         is_stream = bool(payload.get('stream') if isinstance(payload, dict) else False)
 
         # Input guard
-        if config.get('enable_input_guard', True) and prompt:
+        if enable_input_guard and prompt:
             input_result = await guard_manager.scan_input(
                 prompt,
-                block_on_error=config.get('block_on_guard_error', False)
+                block_on_error=block_on_guard_error
             )
             if not input_result.get('allowed', True):
                 logger.warning("Input blocked by LLM Guard: %s", input_result)
                 failed_scanners = extract_failed_scanners(input_result)
                 reason = ', '.join([f"{s['scanner']}: {s['reason']}" for s in failed_scanners]) if failed_scanners else None
+                detected_lang = LanguageDetector.detect_language(prompt)
                 error_message = LanguageDetector.get_error_message('prompt_blocked', detected_lang, reason)
 
                 if inline_guard:
@@ -159,10 +203,16 @@ def create_ollama_endpoints(config, guard_manager):
                 )
 
         # Forward to Ollama
-        path = config.get('ollama_path', '/api/generate')
-        resp, err = await forward_request(config, path, payload=payload, stream=is_stream)
+        inflight = get_inflight_limiter()
+        if is_stream:
+            # The upstream call happens when the stream context is entered
+            resp, err = await forward_request(config, generate_path, payload=payload, stream=True)
+        else:
+            async with inflight:
+                resp, err = await forward_request(config, generate_path, payload=payload, stream=False)
         if err:
             logger.error("Upstream error: %s", err)
+            detected_lang = LanguageDetector.detect_language(prompt)
             error_message = LanguageDetector.get_error_message('upstream_error', detected_lang)
             raise HTTPException(status_code=502, detail={"error": "upstream_error", "message": error_message, "details": err})
 
@@ -170,80 +220,83 @@ def create_ollama_endpoints(config, guard_manager):
         if is_stream:
             # resp is a stream context manager for streaming requests
             async def stream_wrapper():
-                async with resp as response:
+                async with inflight, resp as response:
                     if response.status_code != 200:
-                        data, parse_err = await safe_json(response)
+                        data, parse_err = safe_json(response)
                         logger.error("Upstream returned %s: %s", response.status_code, data or response.text)
                         raise HTTPException(status_code=response.status_code, detail=data or {"error": response.text})
                     
-                    async for chunk in stream_response_with_guard(response, detected_lang):
+                    async for chunk in stream_response_with_guard(response, prompt=prompt):
                         yield chunk
             
             return StreamingResponse(stream_wrapper(), media_type="application/x-ndjson")
 
         if resp.status_code != 200:
-            data, parse_err = await safe_json(resp)
+            data, parse_err = safe_json(resp)
             logger.error("Upstream returned %s: %s", resp.status_code, data or resp.text)
             raise HTTPException(status_code=resp.status_code, detail=data or {"error": resp.text})
 
-        data, parse_err = await safe_json(resp)
+        # Nothing inspects the body without the output guard; relay it as-is
+        if not enable_output_guard:
+            return _relay_upstream_json(resp)
+
+        data, parse_err = safe_json(resp)
         if data is None:
             logger.error("Failed to parse upstream response: %s", parse_err)
+            detected_lang = LanguageDetector.detect_language(prompt)
             error_message = LanguageDetector.get_error_message('server_error', detected_lang)
             raise HTTPException(status_code=502, detail={"error": "invalid_upstream_response", "message": error_message})
 
         # Output guard (non-streaming)
-        if config.get('enable_output_guard', True):
-            output_text = extract_text_from_response(data)
-            output_result = await guard_manager.scan_output(
-                output_text,
-                prompt=prompt,
-                block_on_error=config.get('block_on_guard_error', False)
-            )
-            if not output_result.get('allowed', True):
-                logger.warning("Output blocked by LLM Guard: %s", output_result)
-                
-                # Explicitly close response to free resources immediately
-                try:
-                    await resp.aclose()
-                    logger.info("Connection closed after blocking non-streaming output")
-                except Exception as e:
-                    logger.debug(f"Error closing connection: {e}")
-                
-                failed_scanners = extract_failed_scanners(output_result)
-                error_message = LanguageDetector.get_error_message('response_blocked', detected_lang)
-
-                guard_payload = {
-                    "failed_scanners": failed_scanners,
-                    "type": "output_blocked",
-                    "language": detected_lang,
-                    "scan": output_result,
+        output_text = extract_text_from_response(data)
+        output_result = await guard_manager.scan_output(
+            output_text,
+            prompt=prompt,
+            block_on_error=block_on_guard_error
+        )
+        if not output_result.get('allowed', True):
+            logger.warning("Output blocked by LLM Guard: %s", output_result)
+            
+            # Explicitly close response to free resources immediately
+            try:
+                await resp.aclose()
+                logger.info("Connection closed after blocking non-streaming output")
+            except Exception as e:
+                logger.debug("Error closing connection: %s", e)
+            
+            failed_scanners = extract_failed_scanners(output_result)
+            detected_lang = LanguageDetector.detect_language(prompt)
+            error_message = LanguageDetector.get_error_message('response_blocked', detected_lang)
+
+            guard_payload = {
+                "failed_scanners": failed_scanners,
+                "type": "output_blocked",
+                "language": detected_lang,
+                "scan": output_result,
+            }
+
+            if inline_guard:
+                markdown_message = format_markdown_error("Response blocked", error_message, failed_scanners)
+                return _inline_generate_guard_response(model_name, markdown_message, error_message, False, guard_payload)
+
+            raise HTTPException(
+                status_code=451,
+                detail=error_message,
+                headers={
+                    "X-Error-Type": "content_policy_violation",
+                    "X-Block-Type": "output_blocked",
+                    "X-Language": detected_lang,
+                    "X-Failed-Scanners": json.dumps(failed_scanners)
                 }
+            )
 
-                if inline_guard:
-                    markdown_message = format_markdown_error("Response blocked", error_message, failed_scanners)
-                    return _inline_generate_guard_response(model_name, markdown_message, error_message, False, guard_payload)
-
-                raise HTTPException(
-                    status_code=451,
-                    detail=error_message,
-                    headers={
-                        "X-Error-Type": "content_policy_violation",
-                        "X-Block-Type": "output_blocked",
-                        "X-Language": detected_lang,
-                        "X-Failed-Scanners": json.dumps(failed_scanners)
-                    }
-                )
-
-        return JSONResponse(status_code=200, content=data)
+        # Allowed: relay the upstream bytes rather than re-encoding ``data``
+        return _relay_upstream_json(resp)
 
     @router.post("/api/chat")
     async def proxy_chat(request: Request):
         """Proxy endpoint for Ollama /api/chat."""
-        try:
-            payload = await request.json()
-        except Exception:
-            raise HTTPException(status_code=400, detail={"error": "invalid_json"})
+        payload, _ = await read_json_body(request)
         
         # Extract model and prompt
         model_name = extract_model_from_payload(payload)
@@ -253,21 +306,19 @@ def create_ollama_endpoints(config, guard_manager):
         if logger.isEnabledFor(logging.DEBUG):
             logger.debug("Incoming /api/chat request payload: %s", payload)
         
-        # Detect language from prompt
-        detected_lang = LanguageDetector.detect_language(prompt)
-        inline_guard = inline_guard_errors_enabled(config)
         is_stream = bool(payload.get('stream'))
 
         # Scan input
-        if config.get('enable_input_guard', True) and prompt:
+        if enable_input_guard and prompt:
             input_result = await guard_manager.scan_input(
                 prompt,
-                block_on_error=config.get('block_on_guard_error', False)
+                block_on_error=block_on_guard_error
             )
             if not input_result.get('allowed', True):
-                logger.warning(f"Chat input blocked by LLM Guard: {input_result}")
+                logger.warning("Chat input blocked by LLM Guard: %s", input_result)
                 failed_scanners = extract_failed_scanners(input_result)
                 reason = ', '.join([f"{s['scanner']}: {s['reason']}" for s in failed_scanners]) if failed_scanners else None
+                detected_lang = LanguageDetector.detect_language(prompt)
                 error_message = LanguageDetector.get_error_message('prompt_blocked', detected_lang, reason)
 
                 if inline_guard:
@@ -291,134 +342,110 @@ def create_ollama_endpoints(config, guard_manager):
                 )
         
         # Forward to Ollama chat endpoint
-        ollama_url = config.get('ollama_url')
-        url = f"{ollama_url.rstrip('/')}/api/chat"
+        url = chat_url
         
         try:
             client = get_http_client()
+            inflight = get_inflight_limiter()
             if is_stream:
                 # For streaming, create an async generator that properly manages the context
                 async def stream_wrapper():
-                    async with client.stream("POST", url, json=payload, timeout=300) as resp:
+                    async with inflight, client.stream("POST", url, json=payload, timeout=300) as resp:
                         if resp.status_code != 200:
                             raise HTTPException(status_code=resp.status_code, detail={"error": "upstream_error"})
                         # Use stream_response_with_guard to apply output scanning
-                        async for chunk in stream_response_with_guard(resp, detected_lang):
+                        async for chunk in stream_response_with_guard(resp, prompt=prompt):
                             yield chunk
                 
                 return StreamingResponse(stream_wrapper(), media_type="text/event-stream")
             else:
-                resp = await client.post(url, json=payload, timeout=300)
+                async with inflight:
+                    resp = await client.post(url, json=payload, timeout=300)
                 if resp.status_code != 200:
                     raise HTTPException(status_code=resp.status_code, detail={"error": "upstream_error"})
                 
-                try:
-                    data = resp.json()
-                except:
+                # Nothing inspects the body without the output guard; relay it as-is
+                if not enable_output_guard:
+                    return _relay_upstream_json(resp)
+                
+                data, parse_err = safe_json(resp)
+                if data is None:
+                    detected_lang = LanguageDetector.detect_language(prompt)
                     error_message = LanguageDetector.get_error_message('server_error', detected_lang)
                     raise HTTPException(status_code=502, detail={"error": "invalid_upstream_response", "message": error_message})
                 
                 # Scan output for non-streaming
-                if config.get('enable_output_guard', True):
-                    output_text = ""
-                    if 'message' in data and isinstance(data['message'], dict):
-                        output_text = data['message'].get('content', '')
-                    
-                    if output_text:
-                        output_result = await guard_manager.scan_output(output_text, prompt=prompt)
-                        if not output_result.get('allowed', True):
-                            logger.warning(f"Output blocked: {output_result}")
-                            failed_scanners = extract_failed_scanners(output_result)
-                            error_message = LanguageDetector.get_error_message('response_blocked', detected_lang)
-                            guard_payload = {
-                                "failed_scanners": failed_scanners,
-                                "type": "output_blocked",
+                output_text = ""
+                if 'message' in data and isinstance(data['message'], dict):
+                    output_text = data['message'].get('content', '')
+                
+                if output_text:
+                    output_result = await guard_manager.scan_output(output_text, prompt=prompt)
+                    if not output_result.get('allowed', True):
+                        logger.warning("Output blocked: %s", output_result)
+                        failed_scanners = extract_failed_scanners(output_result)
+                        detected_lang = LanguageDetector.detect_language(prompt)
+                        error_message = LanguageDetector.get_error_message('response_blocked', detected_lang)
+                        guard_payload = {
+                            "failed_scanners": failed_scanners,
+                            "type": "output_blocked",
+                            "language": detected_lang,
+                            "scan": output_result,
+                        }
+
+                        if inline_guard:
+                            markdown_message = format_markdown_error("Response blocked", error_message, failed_scanners)
+                            return _inline_chat_guard_response(model_name, markdown_message, error_message, False, guard_payload)
+
+                        raise HTTPException(
+                            status_code=451,
+                            detail={
+                                "error": "response_blocked",
+                                "message": error_message,
                                 "language": detected_lang,
-                                "scan": output_result,
+                                "details": output_result
                             }
-
-                            if inline_guard:
-                                markdown_message = format_markdown_error("Response blocked", error_message, failed_scanners)
-                                return _inline_chat_guard_response(model_name, markdown_message, error_message, False, guard_payload)
-
-                            raise HTTPException(
-                                status_code=451,
-                                detail={
-                                    "error": "response_blocked",
-                                    "message": error_message,
-                                    "language": detected_lang,
-                                    "details": output_result
-                                }
-                            )
+                        )
                 
-                return JSONResponse(status_code=200, content=data)
+                # Allowed: relay the upstream bytes rather than re-encoding ``data``
+                return _relay_upstream_json(resp)
+        except HTTPException:
+            raise
         except Exception as e:
-            logger.error(f"Upstream error: {e}")
+            logger.error("Upstream error: %s", e)
+            detected_lang = LanguageDetector.detect_language(prompt)
             error_message = LanguageDetector.get_error_message('upstream_error', detected_lang)
             raise HTTPException(status_code=502, detail={"error": "upstream_error", "message": error_message})
 
     @router.post("/api/pull")
     async def proxy_pull(request: Request):
         """Proxy endpoint for Ollama model pull."""
-        try:
-            payload = await request.json()
-        except Exception:
-            raise HTTPException(status_code=400, detail={"error": "invalid_json"})
+        payload, body = await read_json_body(request)
 
-        resp, err = await forward_request(config, '/api/pull', payload=payload, stream=True, timeout=3600)
+        resp, err = await forward_request(config, '/api/pull', payload=payload, body=body, stream=True, timeout=3600)
         if err:
             raise HTTPException(status_code=502, detail={"error": "upstream_error", "details": err})
-        
-        async def stream_bytes():
-            async with resp as response:
-                if response.status_code != 200:
-                    raise HTTPException(status_code=response.status_code, detail={"error": "upstream_error"})
-                async for chunk in response.aiter_bytes():
-                    yield chunk
-        
-        return StreamingResponse(stream_bytes(), media_type="application/x-ndjson")
+        return StreamingResponse(_relay_upstream_stream(resp), media_type="application/x-ndjson")
 
     @router.post("/api/push")
     async def proxy_push(request: Request):
         """Proxy endpoint for Ollama model push."""
-        try:
-            payload = await request.json()
-        except Exception:
-            raise HTTPException(status_code=400, detail={"error": "invalid_json"})
+        payload, body = await read_json_body(request)
 
-        resp, err = await forward_request(config, '/api/push', payload=payload, stream=True, timeout=3600)
+        resp, err = await forward_request(config, '/api/push', payload=payload, body=body, stream=True, timeout=3600)
         if err:
             raise HTTPException(status_code=502, detail={"error": "upstream_error", "details": err})
-        
-        async def stream_bytes():
-            async with resp as response:
-                if response.status_code != 200:
-                    raise HTTPException(status_code=response.status_code, detail={"error": "upstream_error"})
-                async for chunk in response.aiter_bytes():
-                    yield chunk
-        
-        return StreamingResponse(stream_bytes(), media_type="application/x-ndjson")
+        return StreamingResponse(_relay_upstream_stream(resp), media_type="application/x-ndjson")
 
     @router.post("/api/create")
     async def proxy_create(request: Request):
         """Proxy endpoint for Ollama model creation."""
-        try:
-            payload = await request.json()
-        except Exception:
-            raise HTTPException(status_code=400, detail={"error": "invalid_json"})
+        payload, body = await read_json_body(request)
 
-        resp, err = await forward_request(config, '/api/create', payload=payload, stream=True, timeout=3600)
+        resp, err = await forward_request(config, '/api/create', payload=payload, body=body, stream=True, timeout=3600)
         if err:
             raise HTTPException(status_code=502, detail={"error": "upstream_error", "details": err})
-        
-        async def stream_bytes():
-            async with resp as response:
-                if response.status_code != 200:
-                    raise HTTPException(status_code=response.status_code, detail={"error": "upstream_error"})
-                async for chunk in response.aiter_bytes():
-                    yield chunk
-        
-        return StreamingResponse(stream_bytes(), media_type="application/x-ndjson")
+        return StreamingResponse(_relay_upstream_stream(resp), media_type="application/x-ndjson")
 
     @router.get("/api/tags")
     async def proxy_tags(request: Request):
@@ -428,76 +455,55 @@ def create_ollama_endpoints(config, guard_manager):
             raise HTTPException(status_code=502, detail={"error": "upstream_error", "details": err})
         if resp.status_code != 200:
             raise HTTPException(status_code=resp.status_code, detail={"error": "upstream_error"})
-        data, parse_err = await safe_json(resp)
-        if data is None:
-            raise HTTPException(status_code=502, detail={"error": "invalid_upstream_response"})
-        return JSONResponse(status_code=200, content=data)
+        return _relay_upstream_json(resp)
 
     @router.post("/api/show")
     async def proxy_show(request: Request):
         """Proxy endpoint for Ollama show model info."""
-        try:
-            payload = await request.json()
-        except Exception:
-            raise HTTPException(status_code=400, detail={"error": "invalid_json"})
+        payload, body = await read_json_body(request)
 
-        resp, err = await forward_request(config, '/api/show', payload=payload, stream=False, timeout=10)
+        resp, err = await forward_request(config, '/api/show', payload=payload, body=body, stream=False, timeout=10)
         if err:
             raise HTTPException(status_code=502, detail={"error": "upstream_error", "details": err})
         if resp.status_code != 200:
             raise HTTPException(status_code=resp.status_code, detail={"error": "upstream_error"})
-        data, parse_err = await safe_json(resp)
-        if data is None:
-            raise HTTPException(status_code=502, detail={"error": "invalid_upstream_response"})
-        return JSONResponse(status_code=200, content=data)
+        return _relay_upstream_json(resp)
 
     @router.delete("/api/delete")
     async def proxy_delete(request: Request):
         """Proxy endpoint for Ollama delete model."""
-        try:
-            payload = await request.json()
-        except Exception:
-            raise HTTPException(status_code=400, detail={"error": "invalid_json"})
+        payload, body = await read_json_body(request)
 
-        resp, err = await forward_request(config, '/api/delete', payload=payload, stream=False, timeout=10)
+        resp, err = await forward_request(config, '/api/delete', payload=payload, body=body, stream=False, timeout=10)
         if err:
             raise HTTPException(status_code=502, detail={"error": "upstream_error", "details": err})
         if resp.status_code != 200:
             raise HTTPException(status_code=resp.status_code, detail={"error": "upstream_error"})
-        return JSONResponse(status_code=200, content={})
+        return ORJSONResponse(status_code=200, content={})
 
     @router.post("/api/copy")
     async def proxy_copy(request: Request):
         """Proxy endpoint for Ollama copy model."""
-        try:
-            payload = await request.json()
-        except Exception:
-            raise HTTPException(status_code=400, detail={"error": "invalid_json"})
+        payload, body = await read_json_body(request)
 
-        resp, err = await forward_request(config, '/api/copy', payload=payload, stream=False, timeout=10)
+        resp, err = await forward_request(config, '/api/copy', payload=payload, body=body, stream=False, timeout=10)
         if err:
             raise HTTPException(status_code=502, detail={"error": "upstream_error", "details": err})
         if resp.status_code != 200:
             raise HTTPException(status_code=resp.status_code, detail={"error": "upstream_error"})
-        return JSONResponse(status_code=200, content={})
+        return ORJSONResponse(status_code=200, content={})
 
     @router.post("/api/embed")
     async def proxy_embed(request: Request):
         """Proxy endpoint for Ollama generate embeddings."""
-        try:
-            payload = await request.json()
-        except Exception:
-            raise HTTPException(status_code=400, detail={"error": "invalid_json"})
+        payload, body = await read_json_body(request)
 
-        resp, err = await forward_request(config, '/api/embed', payload=payload, stream=False, timeout=30)
+        resp, err = await forward_request(config, '/api/embed', payload=payload, body=body, stream=False, timeout=30)
         if err:
             raise HTTPException(status_code=502, detail={"error": "upstream_error", "details": err})
         if resp.status_code != 200:
             raise HTTPException(status_code=resp.status_code, detail={"error": "upstream_error"})
-        data, parse_err = await safe_json(resp)
-        if data is None:
-            raise HTTPException(status_code=502, detail={"error": "invalid_upstream_response"})
-        return JSONResponse(status_code=200, content=data)
+        return _relay_upstream_json(resp)
 
     @router.get("/api/ps")
     async def proxy_ps(request: Request):
@@ -507,10 +513,7 @@ def create_ollama_endpoints(config, guard_manager):
             raise HTTPException(status_code=502, detail={"error": "upstream_error", "details": err})
         if resp.status_code != 200:
             raise HTTPException(status_code=resp.status_code, detail={"error": "upstream_error"})
-        data, parse_err = await safe_json(resp)
-        if data is None:
-            raise HTTPException(status_code=502, detail={"error": "invalid_upstream_response"})
-        return JSONResponse(status_code=200, content=data)
+        return _relay_upstream_json(resp)
 
     @router.get("/api/version")
     async def proxy_version(request: Request):
@@ -520,9 +523,6 @@ def create_ollama_endpoints(config, guard_manager):
             raise HTTPException(status_code=502, detail={"error": "upstream_error", "details": err})
         if resp.status_code != 200:
             raise HTTPException(status_code=resp.status_code, detail={"error": "upstream_error"})
-        data, parse_err = await safe_json(resp)
-        if data is None:
-            raise HTTPException(status_code=502, detail={"error": "invalid_upstream_response"})
-        return JSONResponse(status_code=200, content=data)
+        return _relay_upstream_json(resp)
     
     return router
@@ -11,13 +11,13 @@ This module contains OpenAI API-compatible endpoints:
 import json
 import logging
 import time
-import uuid
 from typing import Dict, Any
 
+import orjson
 from fastapi import APIRouter, Request, HTTPException
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 
-from ..middleware.http_client import forward_request, safe_json, get_http_client
+from ..middleware.http_client import forward_request, safe_json, get_http_client, get_inflight_limiter, read_json_body
 from ..utils import (
     extract_prompt_from_completion_payload, 
     extract_text_from_response,
@@ -26,6 +26,7 @@ from ..utils import (
     inline_guard_errors_enabled,
     extract_failed_scanners,
     format_markdown_error,
+    new_completion_id,
 )
 from ..utils.language import LanguageDetector
 
@@ -51,6 +52,16 @@ def create_openai_endpoints(config, guard_manager):
         format_sse_event,
     )
 
+    # Upstream targets and guard flags never change at runtime; resolve them once
+    ollama_base_url = config.get('ollama_url', 'http://127.0.0.1:11434').rstrip('/')
+    chat_url = f"{ollama_base_url}/api/chat"
+    generate_url = f"{ollama_base_url}/api/generate"
+    openai_timeout = config.get('openai_timeout', 300)
+    enable_input_guard = config.get('enable_input_guard', True)
+    enable_output_guard = config.get('enable_output_guard', True)
+    block_on_guard_error = config.get('block_on_guard_error', False)
+    inline_guard = inline_guard_errors_enabled(config)
+
     def _zero_usage() -> Dict[str, int]:
         return {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
 
@@ -61,7 +72,7 @@ def create_openai_endpoints(config, guard_manager):
 
         if is_stream:
             async def _chat_error_stream():
-                completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+                completion_id = new_completion_id("chatcmpl")
                 created_ts = int(time.time())
                 role_chunk = {
                     "id": completion_id,
@@ -97,7 +108,7 @@ def create_openai_endpoints(config, guard_manager):
 
             return StreamingResponse(_chat_error_stream(), media_type="text/event-stream")
 
-        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        completion_id = new_completion_id("chatcmpl")
         created_ts = int(time.time())
         result = {
             "id": completion_id,
@@ -115,7 +126,7 @@ def create_openai_endpoints(config, guard_manager):
         }
         if guard_payload:
             result["guard"] = guard_payload
-        return JSONResponse(status_code=200, content=result)
+        return ORJSONResponse(status_code=200, content=result)
 
     def _inline_completion_guard_response(model: str, markdown_message: str, is_stream: bool, guard_payload: Dict[str, Any]):
         usage = guard_payload.get("usage") if guard_payload else None
@@ -124,7 +135,7 @@ def create_openai_endpoints(config, guard_manager):
 
         if is_stream:
             async def _completion_error_stream():
-                completion_id = f"cmpl-{uuid.uuid4().hex}"
+                completion_id = new_completion_id("cmpl")
                 created_ts = int(time.time())
                 chunk = {
                     "id": completion_id,
@@ -146,7 +157,7 @@ def create_openai_endpoints(config, guard_manager):
 
             return StreamingResponse(_completion_error_stream(), media_type="text/event-stream")
 
-        completion_id = f"cmpl-{uuid.uuid4().hex}"
+        completion_id = new_completion_id("cmpl")
         created_ts = int(time.time())
         result = {
             "id": completion_id,
@@ -165,17 +176,13 @@ def create_openai_endpoints(config, guard_manager):
         }
         if guard_payload:
             result["guard"] = guard_payload
-        return JSONResponse(status_code=200, content=result)
+        return ORJSONResponse(status_code=200, content=result)
 
     
     @router.post("/v1/chat/completions")
     async def openai_chat_completions(request: Request):
         """OpenAI-compatible chat completions endpoint with guard integration."""
-        try:
-            payload = await request.json()
-        except Exception as exc:
-            logger.error("Invalid OpenAI request JSON: %s", exc)
-            raise HTTPException(status_code=400, detail={"error": "invalid_json", "message": str(exc)})
+        payload, _ = await read_json_body(request)
         if logger.isEnabledFor(logging.DEBUG):
             logger.debug("Incoming /v1/chat/completions payload: %s", payload)
 
@@ -191,21 +198,20 @@ def create_openai_endpoints(config, guard_manager):
             raise HTTPException(status_code=400, detail={"error": "invalid_model", "message": "model is required."})
 
         is_stream = bool(payload.get('stream', False))
-        inline_guard = inline_guard_errors_enabled(config)
         
         prompt_text = combine_messages_text(messages, roles=('user',), latest_only=True)
-        detected_lang = LanguageDetector.detect_language(prompt_text)
 
-        if config.get('enable_input_guard', True) and prompt_text:
+        if enable_input_guard and prompt_text:
             input_result = await guard_manager.scan_input(
                 prompt_text,
-                block_on_error=config.get('block_on_guard_error', False)
+                block_on_error=block_on_guard_error
             )
             if not input_result.get('allowed', True):
                 logger.warning("OpenAI input blocked by LLM Guard: %s", input_result)
 
                 failed_scanners = extract_failed_scanners(input_result)
                 reason = ', '.join([f"{s['scanner']}: {s['reason']}" for s in failed_scanners]) if failed_scanners else None
+                detected_lang = LanguageDetector.detect_language(prompt_text)
                 error_message = LanguageDetector.get_error_message('prompt_blocked', detected_lang, reason)
 
                 if inline_guard:
@@ -244,16 +250,16 @@ def create_openai_endpoints(config, guard_manager):
         if isinstance(payload.get('functions'), list):
             ollama_payload['functions'] = payload['functions']
 
-        ollama_url = config.get('ollama_url')
-        url = f"{ollama_url.rstrip('/')}/api/chat"
+        url = chat_url
 
         try:
             client = get_http_client()
-            timeout = config.get('openai_timeout', 300)
+            inflight = get_inflight_limiter()
+            timeout = openai_timeout
             if is_stream:
                 # For streaming, pass the stream directly to the handler
                 async def stream_wrapper():
-                    async with client.stream("POST", url, json=ollama_payload, timeout=timeout) as response:
+                    async with inflight, client.stream("POST", url, json=ollama_payload, timeout=timeout) as response:
                         if response.status_code != 200:
                             logger.error("OpenAI upstream returned %s", response.status_code)
                             try:
@@ -262,7 +268,7 @@ def create_openai_endpoints(config, guard_manager):
                                 upstream_detail = {"error": response.text}
                             raise HTTPException(status_code=response.status_code, detail=upstream_detail)
                         
-                        async for chunk in stream_openai_chat_response(response, guard_manager, config, model, detected_lang):
+                        async for chunk in stream_openai_chat_response(response, guard_manager, config, model, prompt=prompt_text):
                             yield chunk
                 
                 return StreamingResponse(
@@ -270,7 +276,8 @@ def create_openai_endpoints(config, guard_manager):
                     media_type="text/event-stream"
                 )
             else:
-                response = await client.post(url, json=ollama_payload, timeout=timeout)
+                async with inflight:
+                    response = await client.post(url, json=ollama_payload, timeout=timeout)
                 
                 if response.status_code != 200:
                     logger.error("OpenAI upstream returned %s", response.status_code)
@@ -281,13 +288,15 @@ def create_openai_endpoints(config, guard_manager):
                     raise HTTPException(status_code=response.status_code, detail=upstream_detail)
         except Exception as exc:
             logger.error("OpenAI upstream error: %s", exc)
+            detected_lang = LanguageDetector.detect_language(prompt_text)
             error_message = LanguageDetector.get_error_message('upstream_error', detected_lang)
             raise HTTPException(status_code=502, detail={"error": "upstream_error", "message": error_message})
 
         try:
-            data = response.json()
+            data = orjson.loads(response.content)
         except Exception as exc:
             logger.error("Failed to parse OpenAI upstream response: %s", exc)
+            detected_lang = LanguageDetector.detect_language(prompt_text)
             error_message = LanguageDetector.get_error_message('server_error', detected_lang)
             # Close connection before raising exception
             try:
@@ -309,11 +318,11 @@ def create_openai_endpoints(config, guard_manager):
             if isinstance(message, dict):
                 output_text = message.get('content', '')
 
-        if config.get('enable_output_guard', True) and output_text:
+        if enable_output_guard and output_text:
             output_result = await guard_manager.scan_output(
                 output_text,
                 prompt=prompt_text,
-                block_on_error=config.get('block_on_guard_error', False)
+                block_on_error=block_on_guard_error
             )
 
             if not output_result.get('allowed', True):
@@ -324,9 +333,10 @@ def create_openai_endpoints(config, guard_manager):
                     await response.aclose()
                     logger.info("Connection closed after blocking OpenAI non-streaming output")
                 except Exception as e:
-                    logger.debug(f"Error closing connection: {e}")
+                    logger.debug("Error closing connection: %s", e)
 
                 failed_scanners = extract_failed_scanners(output_result)
+                detected_lang = LanguageDetector.detect_language(prompt_text)
                 error_message = LanguageDetector.get_error_message('response_blocked', detected_lang)
 
                 guard_payload = {
@@ -358,7 +368,7 @@ def create_openai_endpoints(config, guard_manager):
         except Exception:
             pass
 
-        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        completion_id = new_completion_id("chatcmpl")
         created_ts = int(time.time())
 
         result = {
@@ -382,16 +392,12 @@ def create_openai_endpoints(config, guard_manager):
         if 'system_fingerprint' in data:
             result['system_fingerprint'] = data['system_fingerprint']
 
-        return JSONResponse(status_code=200, content=result)
+        return ORJSONResponse(status_code=200, content=result)
 
     @router.post("/v1/completions")
     async def openai_completions(request: Request):
         """OpenAI-compatible text completions endpoint with guard integration."""
-        try:
-            payload = await request.json()
-        except Exception as exc:
-            logger.error("Invalid OpenAI completion JSON: %s", exc)
-            raise HTTPException(status_code=400, detail={"error": "invalid_json", "message": str(exc)})
+        payload, _ = await read_json_body(request)
         if logger.isEnabledFor(logging.DEBUG):
             logger.debug("Incoming /v1/completions payload: %s", payload)
 
@@ -406,17 +412,16 @@ def create_openai_endpoints(config, guard_manager):
         if not prompt_text:
             raise HTTPException(status_code=400, detail={"error": "invalid_prompt", "message": "prompt must be provided."})
 
-        detected_lang = LanguageDetector.detect_language(prompt_text)
         is_stream = bool(payload.get('stream', False))
-        inline_guard = inline_guard_errors_enabled(config)
 
-        if config.get('enable_input_guard', True) and prompt_text:
-            input_result = await guard_manager.scan_input(prompt_text, block_on_error=config.get('block_on_guard_error', False))
+        if enable_input_guard and prompt_text:
+            input_result = await guard_manager.scan_input(prompt_text, block_on_error=block_on_guard_error)
             if not input_result.get('allowed', True):
                 logger.warning("OpenAI completion input blocked by LLM Guard: %s", input_result)
 
                 failed_scanners = extract_failed_scanners(input_result)
                 reason = ', '.join([f"{s['scanner']}: {s['reason']}" for s in failed_scanners]) if failed_scanners else None
+                detected_lang = LanguageDetector.detect_language(prompt_text)
                 error_message = LanguageDetector.get_error_message('prompt_blocked', detected_lang, reason)
 
                 if inline_guard:
@@ -453,16 +458,16 @@ def create_openai_endpoints(config, guard_manager):
         if isinstance(payload.get('images'), list):
             ollama_payload['images'] = payload['images']
 
-        ollama_url = config.get('ollama_url')
-        url = f"{ollama_url.rstrip('/')}/api/generate"
+        url = generate_url
 
         try:
             client = get_http_client()
-            timeout = config.get('openai_timeout', 300)
+            inflight = get_inflight_limiter()
+            timeout = openai_timeout
             if is_stream:
                 # For streaming, wrap in an async generator that manages the context
                 async def stream_wrapper():
-                    async with client.stream("POST", url, json=ollama_payload, timeout=timeout) as response:
+                    async with inflight, client.stream("POST", url, json=ollama_payload, timeout=timeout) as response:
                         if response.status_code != 200:
                             logger.error("OpenAI completion upstream returned %s", response.status_code)
                             try:
@@ -471,7 +476,7 @@ def create_openai_endpoints(config, guard_manager):
                                 upstream_detail = {"error": response.text}
                             raise HTTPException(status_code=response.status_code, detail=upstream_detail)
                         
-                        async for chunk in stream_openai_completion_response(response, guard_manager, config, model, detected_lang):
+                        async for chunk in stream_openai_completion_response(response, guard_manager, config, model, prompt=prompt_text):
                             yield chunk
                 
                 return StreamingResponse(
@@ -479,7 +484,8 @@ def create_openai_endpoints(config, guard_manager):
                     media_type="text/event-stream"
                 )
             else:
-                response = await client.post(url, json=ollama_payload, timeout=timeout)
+                async with inflight:
+                    response = await client.post(url, json=ollama_payload, timeout=timeout)
                 
                 if response.status_code != 200:
                     logger.error("OpenAI completion upstream returned %s", response.status_code)
@@ -490,6 +496,7 @@ def create_openai_endpoints(config, guard_manager):
                     raise HTTPException(status_code=response.status_code, detail=upstream_detail)
         except Exception as exc:
             logger.error("OpenAI completion upstream error: %s", exc)
+            detected_lang = LanguageDetector.detect_language(prompt_text)
             error_message = LanguageDetector.get_error_message('upstream_error', detected_lang)
             raise HTTPException(status_code=502, detail={"error": "upstream_error", "message": error_message})
 
@@ -498,9 +505,10 @@ def create_openai_endpoints(config, guard_manager):
             pass
 
         try:
-            data = response.json()
+            data = orjson.loads(response.content)
         except Exception as exc:
             logger.error("Failed to parse completion upstream response: %s", exc)
+            detected_lang = LanguageDetector.detect_language(prompt_text)
             error_message = LanguageDetector.get_error_message('server_error', detected_lang)
             # Close connection before raising exception
             try:
@@ -519,11 +527,11 @@ def create_openai_endpoints(config, guard_manager):
 
         output_text = extract_text_from_response(data)
 
-        if config.get('enable_output_guard', True) and output_text:
+        if enable_output_guard and output_text:
             output_result = await guard_manager.scan_output(
                 output_text,
                 prompt=prompt_text,
-                block_on_error=config.get('block_on_guard_error', False)
+                block_on_error=block_on_guard_error
             )
             if not output_result.get('allowed', True):
                 logger.warning("OpenAI completion output blocked by LLM Guard: %s", output_result)
@@ -533,9 +541,10 @@ def create_openai_endpoints(config, guard_manager):
                     await response.aclose()
                     logger.info("Connection closed after blocking completion non-streaming output")
                 except Exception as e:
-                    logger.debug(f"Error closing connection: {e}")
+                    logger.debug("Error closing connection: %s", e)
                 
                 failed_scanners = extract_failed_scanners(output_result)
+                detected_lang = LanguageDetector.detect_language(prompt_text)
                 error_message = LanguageDetector.get_error_message('response_blocked', detected_lang)
 
                 guard_payload = {
@@ -567,7 +576,7 @@ def create_openai_endpoints(config, guard_manager):
         except Exception:
             pass
 
-        completion_id = f"cmpl-{uuid.uuid4().hex}"
+        completion_id = new_completion_id("cmpl")
         created_ts = int(time.time())
 
         result = {
@@ -589,46 +598,40 @@ def create_openai_endpoints(config, guard_manager):
         if 'system_fingerprint' in data:
             result['system_fingerprint'] = data['system_fingerprint']
 
-        return JSONResponse(status_code=200, content=result)
+        return ORJSONResponse(status_code=200, content=result)
 
     @router.post("/v1/embeddings")
     async def proxy_openai_embed(request: Request):
         """Proxy endpoint for OpenAI-compatible embeddings."""
-        try:
-            payload = await request.json()
-        except Exception:
-            raise HTTPException(status_code=400, detail={"error": "invalid_json"})
+        payload, body = await read_json_body(request)
         if logger.isEnabledFor(logging.DEBUG):
             logger.debug("Incoming /v1/embeddings payload: %s", payload)
 
-        resp, err = await forward_request(config, '/v1/embeddings', payload=payload, stream=False, timeout=30)
+        resp, err = await forward_request(config, '/v1/embeddings', payload=payload, body=body, stream=False, timeout=30)
         if err:
             raise HTTPException(status_code=502, detail={"error": "upstream_error", "details": err})
         if resp.status_code != 200:
             raise HTTPException(status_code=resp.status_code, detail={"error": "upstream_error"})
-        data, parse_err = await safe_json(resp)
+        data, parse_err = safe_json(resp)
         if data is None:
             raise HTTPException(status_code=502, detail={"error": "invalid_upstream_response"})
-        return JSONResponse(status_code=200, content=data)
+        return ORJSONResponse(status_code=200, content=data)
 
     @router.post("/v1/models")
     async def proxy_openai_models(request: Request):
         """Proxy endpoint for OpenAI-compatible models list."""
-        try:
-            payload = await request.json()
-        except Exception:
-            raise HTTPException(status_code=400, detail={"error": "invalid_json"})
+        payload, body = await read_json_body(request)
         if logger.isEnabledFor(logging.DEBUG):
             logger.debug("Incoming /v1/models payload: %s", payload)
 
-        resp, err = await forward_request(config, '/v1/models', payload=payload, stream=False, timeout=30)
+        resp, err = await forward_request(config, '/v1/models', payload=payload, body=body, stream=False, timeout=30)
         if err:
             raise HTTPException(status_code=502, detail={"error": "upstream_error", "details": err})
         if resp.status_code != 200:
             raise HTTPException(status_code=resp.status_code, detail={"error": "upstream_error"})
-        data, parse_err = await safe_json(resp)
+        data, parse_err = safe_json(resp)
         if data is None:
             raise HTTPException(status_code=502, detail={"error": "invalid_upstream_response"})
-        return JSONResponse(status_code=200, content=data)
+        return ORJSONResponse(status_code=200, content=data)
     
     return router
@@ -9,20 +9,20 @@ Contains functions for handling streaming responses with output guard scanning:
 
 from __future__ import annotations
 
-import json
 import logging
 import time
-import uuid
 from datetime import datetime, timezone
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 import httpx
+import orjson
 
 from ..utils.language import LanguageDetector
 from ..utils import (
     inline_guard_errors_enabled,
     extract_failed_scanners,
     format_markdown_error,
+    new_completion_id,
 )
 
 logger = logging.getLogger(__name__)
@@ -63,7 +63,31 @@ def _build_guard_block_chunk(model_name: str | None,
     }
 
 
-async def stream_response_with_guard(response: httpx.Response, guard_manager, config, detected_lang: str = 'en'):
+async def _aiter_ndjson_lines(response: httpx.Response):
+    """Yield raw NDJSON lines (bytes, without the trailing newline) from a streaming response.
+
+    Works on the byte stream directly so pass-through lines never round-trip through str.
+    Only the newly received chunk is searched for newlines, so long lines split across
+    many chunks stay linear instead of rescanning the whole buffer each time.
+    """
+    buffer = bytearray()
+    async for chunk in response.aiter_bytes():
+        if not chunk:
+            continue
+        start = len(buffer)
+        buffer += chunk
+        end = buffer.rfind(b"\n", start)
+        if end < 0:
+            continue
+        complete = bytes(buffer[:end])
+        del buffer[:end + 1]
+        for line in complete.split(b"\n"):
+            yield line.rstrip(b"\r")
+    if buffer:
+        yield bytes(buffer).rstrip(b"\r")
+
+
+async def stream_response_with_guard(response: httpx.Response, guard_manager, config, detected_lang: Optional[str] = None, prompt: str = ''):
     """Stream response with output scanning.
     
     Handles both /api/generate format (response field) and /api/chat format (message.content field).
@@ -73,7 +97,8 @@ async def stream_response_with_guard(response: httpx.Response, guard_manager, co
         response: The httpx streaming response
         guard_manager: LLMGuardManager instance for scanning
         config: Configuration object
-        detected_lang: Detected language code for error messages
+        detected_lang: Language code for error messages; detected from prompt on first use when omitted
+        prompt: Prompt text used for lazy language detection
     """
     accumulated_text = ""
     blocked = False
@@ -81,29 +106,28 @@ async def stream_response_with_guard(response: httpx.Response, guard_manager, co
     
     # Ensure response is an httpx.Response object
     if not isinstance(response, httpx.Response):
-        logger.error(f"Invalid response type: {type(response)}. Expected httpx.Response")
+        logger.error("Invalid response type: %s. Expected httpx.Response", type(response))
         raise TypeError(f"Expected httpx.Response, got {type(response).__name__}")
     
     inline_guard = inline_guard_errors_enabled(config)
+    output_guard_enabled = config.get('enable_output_guard', True)
 
     try:
-        async for line in response.aiter_lines():
-            if not line or not isinstance(line, str):
-                if line:
-                    logger.debug(f"Skipping non-string line: {type(line)}")
+        async for line in _aiter_ndjson_lines(response):
+            if not line:
                 continue
             
             try:
-                data = json.loads(line)
-            except json.JSONDecodeError:
-                logger.debug(f"Skipping non-JSON line: {line[:100]}")
-                yield line + '\n'
+                data = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                logger.debug("Skipping non-JSON line: %r", line[:100])
+                yield line + b'\n'
                 continue
             
             # Ensure data is a dictionary
             if not isinstance(data, dict):
-                logger.debug(f"Skipping non-dict JSON: {type(data)}")
-                yield line + '\n'
+                logger.debug("Skipping non-dict JSON: %s", type(data))
+                yield line + b'\n'
                 continue
             
             # Track model if present
@@ -117,7 +141,7 @@ async def stream_response_with_guard(response: httpx.Response, guard_manager, co
                 if isinstance(response_text, str):
                     accumulated_text += response_text
                 else:
-                    logger.debug(f"Non-string response field: {type(response_text)}")
+                    logger.debug("Non-string response field: %s", type(response_text))
             # Handle /api/chat format: {"message": {"content": "text"}}
             elif 'message' in data:
                 message = data.get('message')
@@ -126,15 +150,16 @@ async def stream_response_with_guard(response: httpx.Response, guard_manager, co
                     if isinstance(content, str):
                         accumulated_text += content
                     else:
-                        logger.debug(f"Non-string message.content: {type(content)}")
+                        logger.debug("Non-string message.content: %s", type(content))
             
             # Scan accumulated text periodically (every min_output_length chars)
-            if len(accumulated_text) > min_output_length and config.get('enable_output_guard', True):
+            if len(accumulated_text) > min_output_length and output_guard_enabled:
                 output_result = await guard_manager.scan_output(accumulated_text)
                 if not output_result.get('allowed', True):
-                    logger.warning(f"Streaming output blocked by LLM Guard: {output_result}")
+                    logger.warning("Streaming output blocked by LLM Guard: %s", output_result)
                     blocked = True
                     failed_scanners = extract_failed_scanners(output_result)
+                    detected_lang = detected_lang or LanguageDetector.detect_language(prompt)
                     error_message = LanguageDetector.get_error_message('response_blocked', detected_lang)
                     guard_payload = {
                         "failed_scanners": failed_scanners,
@@ -145,7 +170,7 @@ async def stream_response_with_guard(response: httpx.Response, guard_manager, co
                     }
                     message_content = format_markdown_error("Response blocked", error_message, failed_scanners) if inline_guard else error_message
                     block_chunk = _build_guard_block_chunk(last_model, message_content, detected_lang, guard_payload)
-                    yield (json.dumps(block_chunk) + '\n')
+                    yield orjson.dumps(block_chunk) + b'\n'
                     
                     # Immediately close connection to stop Ollama generation
                     await response.aclose()
@@ -153,15 +178,16 @@ async def stream_response_with_guard(response: httpx.Response, guard_manager, co
                     break
                 accumulated_text = ""  # Reset for next batch
             
-            yield line + '\n'
+            yield line + b'\n'
         
         # Final scan of any remaining text (only if not already blocked)
-        if not blocked and accumulated_text and config.get('enable_output_guard', True):
+        if not blocked and accumulated_text and output_guard_enabled:
             output_result = await guard_manager.scan_output(accumulated_text)
             if not output_result.get('allowed', True):
-                logger.warning(f"Final streaming output blocked: {output_result}")
+                logger.warning("Final streaming output blocked: %s", output_result)
                 blocked = True
                 failed_scanners = extract_failed_scanners(output_result)
+                detected_lang = detected_lang or LanguageDetector.detect_language(prompt)
                 error_message = LanguageDetector.get_error_message('response_blocked', detected_lang)
                 guard_payload = {
                     "failed_scanners": failed_scanners,
@@ -172,10 +198,11 @@ async def stream_response_with_guard(response: httpx.Response, guard_manager, co
                 }
                 message_content = format_markdown_error("Response blocked", error_message, failed_scanners) if inline_guard else error_message
                 block_chunk = _build_guard_block_chunk(last_model, message_content, detected_lang, guard_payload)
-                yield (json.dumps(block_chunk) + '\n')
+                yield orjson.dumps(block_chunk) + b'\n'
     
     except Exception as e:
-        logger.error(f"Error during streaming: {e}", exc_info=True)
+        logger.error("Error during streaming: %s", e, exc_info=True)
+        detected_lang = detected_lang or LanguageDetector.detect_language(prompt)
         error_message = LanguageDetector.get_error_message('server_error', detected_lang)
         guard_payload = {
             "failed_scanners": [],
@@ -184,7 +211,7 @@ async def stream_response_with_guard(response: httpx.Response, guard_manager, co
             "message": error_message,
         }
         fallback_chunk = _build_guard_block_chunk(last_model, error_message, detected_lang, guard_payload)
-        yield (json.dumps(fallback_chunk) + '\n')
+        yield orjson.dumps(fallback_chunk) + b'\n'
     finally:
         # Ensure connection is always closed
         if not blocked:  # Only close if not already closed in the block above
@@ -192,15 +219,15 @@ async def stream_response_with_guard(response: httpx.Response, guard_manager, co
                 await response.aclose()
                 logger.debug("Connection closed after streaming completed")
             except Exception as e:
-                logger.debug(f"Connection already closed: {e}")
+                logger.debug("Connection already closed: %s", e)
 
 
 def format_sse_event(data: Dict[str, Any]) -> bytes:
     """Serialize a chunk for Server-Sent Events streaming."""
-    return f"data: {json.dumps(data)}\n\n".encode()
+    return b"data: " + orjson.dumps(data) + b"\n\n"
 
 
-async def stream_openai_chat_response(response: httpx.Response, guard_manager, config, model: str, detected_lang: str = 'en'):
+async def stream_openai_chat_response(response: httpx.Response, guard_manager, config, model: str, detected_lang: Optional[str] = None, prompt: str = ''):
     """Stream OpenAI-compatible chat completions with guard scanning.
     
     Ensures proper connection cleanup and resource freeing when output is blocked.
@@ -210,9 +237,10 @@ async def stream_openai_chat_response(response: httpx.Response, guard_manager, c
         guard_manager: LLMGuardManager instance for scanning
         config: Configuration object
         model: Model name
-        detected_lang: Detected language code for error messages
+        detected_lang: Language code for error messages; detected from prompt on first use when omitted
+        prompt: Prompt text used for lazy language detection
     """
-    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    completion_id = new_completion_id("chatcmpl")
     created_ts = int(time.time())
     total_text = ""
     scan_buffer = ""
@@ -220,15 +248,16 @@ async def stream_openai_chat_response(response: httpx.Response, guard_manager, c
     block_on_error = config.get('block_on_guard_error', False)
     blocked = False
     inline_guard = inline_guard_errors_enabled(config)
+    output_guard_enabled = config.get('enable_output_guard', True)
 
     try:
-        async for raw_line in response.aiter_lines():
+        async for raw_line in _aiter_ndjson_lines(response):
             if not raw_line:
                 continue
 
             try:
-                data = json.loads(raw_line)
-            except json.JSONDecodeError:
+                data = orjson.loads(raw_line)
+            except orjson.JSONDecodeError:
                 logger.debug("Skipping non-JSON streaming chunk: %s", raw_line)
                 continue
 
@@ -256,17 +285,17 @@ async def stream_openai_chat_response(response: httpx.Response, guard_manager, c
                 return
 
             if not isinstance(data, dict):
-                logger.debug(f"Skipping non-dict response in OpenAI chat: {type(data)}")
+                logger.debug("Skipping non-dict response in OpenAI chat: %s", type(data))
                 continue
             
             message = data.get('message', {})
             if not isinstance(message, dict):
-                logger.debug(f"Invalid message type in OpenAI chat: {type(message)}")
+                logger.debug("Invalid message type in OpenAI chat: %s", type(message))
                 continue
             
             delta_text = message.get('content', '')
             if not isinstance(delta_text, str):
-                logger.debug(f"Invalid content type in OpenAI chat: {type(delta_text)}")
+                logger.debug("Invalid content type in OpenAI chat: %s", type(delta_text))
                 delta_text = str(delta_text) if delta_text else ''
 
             if delta_text:
@@ -292,12 +321,13 @@ async def stream_openai_chat_response(response: httpx.Response, guard_manager, c
                 total_text += delta_text
                 scan_buffer += delta_text
 
-                if config.get('enable_output_guard', True) and len(scan_buffer) >= min_output_length:
+                if output_guard_enabled and len(scan_buffer) >= min_output_length:
                     scan_result = await guard_manager.scan_output(scan_buffer, block_on_error=block_on_error)
                     if not scan_result.get('allowed', True):
                         logger.warning("Streaming OpenAI output blocked by LLM Guard: %s", scan_result)
                         blocked = True
                         failed_scanners = extract_failed_scanners(scan_result)
+                        detected_lang = detected_lang or LanguageDetector.detect_language(prompt)
                         error_message = LanguageDetector.get_error_message('response_blocked', detected_lang)
                         markdown_body = format_markdown_error("Content policy violation", error_message, failed_scanners)
 
@@ -372,12 +402,13 @@ async def stream_openai_chat_response(response: httpx.Response, guard_manager, c
                 usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
 
                 remaining_text = scan_buffer or (total_text if len(total_text) <= min_output_length else "")
-                if config.get('enable_output_guard', True) and remaining_text:
+                if output_guard_enabled and remaining_text:
                     scan_result = await guard_manager.scan_output(remaining_text, block_on_error=block_on_error)
                     if not scan_result.get('allowed', True):
                         logger.warning("Final OpenAI streaming output blocked: %s", scan_result)
                         blocked = True
                         failed_scanners = extract_failed_scanners(scan_result)
+                        detected_lang = detected_lang or LanguageDetector.detect_language(prompt)
                         error_message = LanguageDetector.get_error_message('response_blocked', detected_lang)
                         markdown_body = format_markdown_error("Content policy violation", error_message, failed_scanners)
                         delta_content = markdown_body if inline_guard else error_message
@@ -426,9 +457,10 @@ async def stream_openai_chat_response(response: httpx.Response, guard_manager, c
 
     except Exception as exc:
         logger.error("Error during OpenAI streaming: %s", exc)
+        detected_lang = detected_lang or LanguageDetector.detect_language(prompt)
         error_message = LanguageDetector.get_error_message('server_error', detected_lang)
         error_chunk = {
-            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "id": new_completion_id("chatcmpl"),
             "object": "chat.completion.chunk",
             "created": int(time.time()),
             "model": model,
@@ -451,10 +483,10 @@ async def stream_openai_chat_response(response: httpx.Response, guard_manager, c
                 await response.aclose()
                 logger.debug("Connection closed after OpenAI chat streaming completed")
             except Exception as e:
-                logger.debug(f"Connection already closed: {e}")
+                logger.debug("Connection already closed: %s", e)
 
 
-async def stream_openai_completion_response(response: httpx.Response, guard_manager, config, model: str, detected_lang: str = 'en'):
+async def stream_openai_completion_response(response: httpx.Response, guard_manager, config, model: str, detected_lang: Optional[str] = None, prompt: str = ''):
     """Stream OpenAI-compatible text completions with guard scanning.
     
     Ensures proper connection cleanup and resource freeing when output is blocked.
@@ -464,24 +496,26 @@ async def stream_openai_completion_response(response: httpx.Response, guard_mana
         guard_manager: LLMGuardManager instance for scanning
         config: Configuration object
         model: Model name
-        detected_lang: Detected language code for error messages
+        detected_lang: Language code for error messages; detected from prompt on first use when omitted
+        prompt: Prompt text used for lazy language detection
     """
-    completion_id = f"cmpl-{uuid.uuid4().hex}"
+    completion_id = new_completion_id("cmpl")
     created_ts = int(time.time())
     total_text = ""
     scan_buffer = ""
     block_on_error = config.get('block_on_guard_error', False)
     blocked = False
     inline_guard = inline_guard_errors_enabled(config)
+    output_guard_enabled = config.get('enable_output_guard', True)
 
     try:
-        async for raw_line in response.aiter_lines():
+        async for raw_line in _aiter_ndjson_lines(response):
             if not raw_line:
                 continue
 
             try:
-                data = json.loads(raw_line)
-            except json.JSONDecodeError:
+                data = orjson.loads(raw_line)
+            except orjson.JSONDecodeError:
                 logger.debug("Skipping non-JSON completion chunk: %s", raw_line)
                 continue
 
@@ -515,12 +549,13 @@ async def stream_openai_completion_response(response: httpx.Response, guard_mana
                 total_text += delta_text
                 scan_buffer += delta_text
 
-                if config.get('enable_output_guard', True) and len(scan_buffer) >= min_output_length:
+                if output_guard_enabled and len(scan_buffer) >= min_output_length:
                     scan_result = await guard_manager.scan_output(scan_buffer, block_on_error=block_on_error)
                     if not scan_result.get('allowed', True):
                         logger.warning("Streaming completion output blocked: %s", scan_result)
                         blocked = True
                         failed_scanners = extract_failed_scanners(scan_result)
+                        detected_lang = detected_lang or LanguageDetector.detect_language(prompt)
                         error_message = LanguageDetector.get_error_message('response_blocked', detected_lang)
                         markdown_body = format_markdown_error("Content policy violation", error_message, failed_scanners)
                         block_text = markdown_body if inline_guard else error_message
@@ -572,12 +607,13 @@ async def stream_openai_completion_response(response: httpx.Response, guard_mana
                 usage['total_tokens'] = usage['prompt_tokens'] + usage['completion_tokens']
 
                 remaining_text = scan_buffer or (total_text if len(total_text) <= min_output_length else "")
-                if config.get('enable_output_guard', True) and remaining_text:
+                if output_guard_enabled and remaining_text:
                     scan_result = await guard_manager.scan_output(remaining_text, block_on_error=block_on_error)
                     if not scan_result.get('allowed', True):
                         logger.warning("Final completion output blocked: %s", scan_result)
                         blocked = True
                         failed_scanners = extract_failed_scanners(scan_result)
+                        detected_lang = detected_lang or LanguageDetector.detect_language(prompt)
                         error_message = LanguageDetector.get_error_message('response_blocked', detected_lang)
                         markdown_body = format_markdown_error("Content policy violation", error_message, failed_scanners)
                         block_text = markdown_body if inline_guard else error_message
@@ -626,9 +662,10 @@ async def stream_openai_completion_response(response: httpx.Response, guard_mana
 
     except Exception as exc:
         logger.error("Error during OpenAI completion streaming: %s", exc)
+        detected_lang = detected_lang or LanguageDetector.detect_language(prompt)
         error_message = LanguageDetector.get_error_message('server_error', detected_lang)
         error_chunk = {
-            "id": f"cmpl-{uuid.uuid4().hex}",
+            "id": new_completion_id("cmpl"),
             "object": "text_completion",
             "created": int(time.time()),
             "model": model,
@@ -650,7 +687,7 @@ async def stream_openai_completion_response(response: httpx.Response, guard_mana
                 await response.aclose()
                 logger.debug("Connection closed after completion streaming completed")
             except Exception as e:
-                logger.debug(f"Connection already closed: {e}")
+                logger.debug("Connection already closed: %s", e)
 
 
 def create_streaming_handlers(config, guard_manager):
@@ -666,9 +703,9 @@ def create_streaming_handlers(config, guard_manager):
     Returns:
         Streaming handler function
     """
-    async def stream_with_guard(response: httpx.Response, detected_lang: str = 'en'):
+    async def stream_with_guard(response: httpx.Response, detected_lang: Optional[str] = None, prompt: str = ''):
         """Wrapper function that injects dependencies into stream_response_with_guard."""
-        async for chunk in stream_response_with_guard(response, guard_manager, config, detected_lang):
+        async for chunk in stream_response_with_guard(response, guard_manager, config, detected_lang, prompt):
             yield chunk
     
     return stream_with_guard
@@ -6,13 +6,14 @@ This module contains the FastAPI application factory and main server logic.
 
 from __future__ import annotations
 
+import importlib.util
 import logging
 import logging.handlers
 import os
-import time
+import sys
 import warnings
 from contextlib import asynccontextmanager
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Tuple
 
 # =============================================================================
 # EARLY LOGGING CONFIGURATION - MUST BE BEFORE ANY IMPORTS THAT USE LLM-GUARD
@@ -95,10 +96,11 @@ logger.setLevel(_LOG_LEVEL)
 # =============================================================================
 
 import uvicorn
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import ORJSONResponse
+from fastapi.responses import ORJSONResponse, Response
+from starlette.exceptions import HTTPException as StarletteHTTPException
 
 # Suppress the FutureWarning about TRANSFORMERS_CACHE being deprecated in transformers v5
 # This warning comes from llm-guard dependencies, not our code
@@ -107,6 +109,7 @@ warnings.filterwarnings('ignore', category=FutureWarning, module='transformers.u
 from .core.config import Config
 from .guards.guard_manager import LLMGuardManager
 from .middleware.http_client import close_http_client, get_http_client
+from .middleware.proxy_request import ProxyRequestMiddleware
 from .utils import force_cpu_mode
 
 # Set HF_HOME before any transformers imports to avoid TRANSFORMERS_CACHE deprecation warning
@@ -194,6 +197,14 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     _flush_log_buffer()
 
 
+async def _http_exception_handler(request, exc: StarletteHTTPException) -> Response:
+    """Render HTTPException detail with orjson (same body shape as FastAPI's handler)."""
+    headers = getattr(exc, "headers", None)
+    if exc.status_code in (204, 304):
+        return Response(status_code=exc.status_code, headers=headers)
+    return ORJSONResponse({"detail": exc.detail}, status_code=exc.status_code, headers=headers)
+
+
 def create_app(config_file: str | None = None) -> FastAPI:
     """
     Create and configure the FastAPI application.
@@ -232,6 +243,10 @@ def create_app(config_file: str | None = None) -> FastAPI:
         lifespan=lifespan,
     )
 
+    # HTTPException bodies go through the exception handler, not the default
+    # response class, so render them with orjson as well
+    app.add_exception_handler(StarletteHTTPException, _http_exception_handler)
+
     # Store components in app state
     app.state.config = config
     app.state.guard_manager = guard_manager
@@ -264,56 +279,13 @@ def create_app(config_file: str | None = None) -> FastAPI:
         allowed_hosts=trusted_hosts + ["*"] if config.get("forwarded_allow_ips") == "*" else trusted_hosts
     )
 
-    # Skip logging for health check endpoints to reduce I/O
-    _skip_log_paths = frozenset({"/health", "/favicon.ico", "/metrics"})
-    
-    # Check if we should enable access logging (disabled by default for performance)
-    _enable_access_log = config.get_bool("enable_access_log", False)
-
-    @app.middleware("http")
-    async def log_requests(request: Request, call_next: Any) -> Any:
-        """Log requests with path and timing (optimized for performance)."""
-        path = request.url.path
-        
-        # Skip logging for health checks and static assets to reduce I/O
-        if path in _skip_log_paths or not _enable_access_log:
-            return await call_next(request)
-        
-        # Only log at DEBUG level for regular requests to reduce disk I/O
-        if logger.isEnabledFor(logging.DEBUG):
-            logger.debug("Request: %s %s", request.method, path)
-        
-        start_ts = time.time()
-        try:
-            response = await call_next(request)
-            return response
-        finally:
-            # Only log timing for slow requests (>1s) or errors at INFO level
-            duration_ms = int((time.time() - start_ts) * 1000)
-            response_obj = locals().get("response", None)
-            status_code = getattr(response_obj, "status_code", 0) if response_obj else 0
-            
-            # Log slow requests (>1000ms) or errors at WARNING level
-            if duration_ms > 1000 or status_code >= 400:
-                logger.warning("Slow/Error: %s %s -> %s (%d ms)", 
-                              request.method, path, status_code, duration_ms)
-            elif logger.isEnabledFor(logging.DEBUG):
-                logger.debug("Response: %s (%d ms)", status_code, duration_ms)
-
-    @app.middleware("http")
-    async def handle_reverse_proxy_headers(request: Request, call_next: Any) -> Any:
-        """
-        Handle X-Forwarded-* headers for reverse proxy support.
-        Enables proper client IP detection when behind nginx, Apache, etc.
-        """
-        response = await call_next(request)
-        
-        # Add Via header for reverse proxy chain visibility
-        via = response.headers.get("Via", "")
-        app_name = "Ollama-Guardrails/1.0"
-        response.headers["Via"] = f"{via}, {app_name}" if via else f"1.1 {app_name}"
-        
-        return response
+    # Access logging + Via header in a single pure ASGI middleware
+    # (access logging disabled by default for performance)
+    app.add_middleware(
+        ProxyRequestMiddleware,
+        enable_access_log=config.get_bool("enable_access_log", False),
+        skip_log_paths=("/health", "/favicon.ico", "/metrics"),
+    )
 
     # Create and register endpoint routers
     ollama_router = create_ollama_endpoints(
@@ -343,6 +315,33 @@ def create_app(config_file: str | None = None) -> FastAPI:
 app = create_app()
 
 
+def _resolve_workers(value: Any) -> int:
+    """Turn the ``workers`` setting into a uvicorn worker count.
+
+    ``"auto"`` means one worker per CPU core (as documented in config.yaml);
+    anything that is not a positive integer falls back to a single worker.
+    """
+    if isinstance(value, str) and value.strip().lower() == "auto":
+        return os.cpu_count() or 1
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        logger.warning("Invalid workers setting %r; using 1 worker", value)
+        return 1
+
+
+def _select_server_impls() -> Tuple[str, str]:
+    """Pick uvicorn's event loop and HTTP parser, preferring the C implementations.
+
+    uvloop/httptools come with the ``performance`` extras and are unavailable
+    on Windows, where this falls back to asyncio/h11.
+    """
+    use_uvloop = sys.platform != "win32" and importlib.util.find_spec("uvloop") is not None
+    loop_impl = "uvloop" if use_uvloop else "asyncio"
+    http_impl = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    return loop_impl, http_impl
+
+
 def run_server() -> None:
     """
     Run the server with Uvicorn.
@@ -366,11 +365,21 @@ def run_server() -> None:
     logger.info("  Admin API: /health, /config, /stats")
     logger.info("=" * 60)
     
-    # Simple Uvicorn configuration - FastAPI handles async concurrency
+    loop_impl, http_impl = _select_server_impls()
+    # Each worker loads its own guard models, so multi-process is opt-in
+    workers = _resolve_workers(config.get("workers", 1))
+    logger.info("Uvicorn: loop=%s, http=%s, workers=%s", loop_impl, http_impl, workers)
+    
+    # Uvicorn's per-request access log is disabled; ProxyRequestMiddleware logs
+    # slow/failed requests when enable_access_log is set.
     uvicorn.run(
-        app,
+        "ollama_guardrails.app:app" if workers > 1 else app,
         host=host,
         port=port,
+        workers=workers,
+        loop=loop_impl,
+        http=http_impl,
+        access_log=False,
     )
 
 
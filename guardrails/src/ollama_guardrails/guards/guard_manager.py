@@ -2,8 +2,12 @@ import logging
 import os
 import platform
 import asyncio
+import importlib.util
+from functools import lru_cache
 from typing import Dict, Any, Tuple, Optional
 
+from ..utils.device_config import get_mps_memory_stats
+
 logger = logging.getLogger(__name__)
 code_language = ['Python', 'C#', 'C++', 'C']
 
@@ -12,55 +16,81 @@ code_language = ['Python', 'C#', 'C++', 'C']
 from ..utils.tiktoken_cache import setup_tiktoken_offline_mode
 setup_tiktoken_offline_mode()
 
-# Direct imports from llm-guard
-try:
-    from llm_guard.input_scanners import (
-        BanSubstrings as InputBanSubstrings,
-        PromptInjection,
-        Toxicity as InputToxicity,
-        Secrets,
-        Code as InputCode,
-        Anonymize,
-    )
-    from llm_guard.output_scanners import (
-        BanSubstrings as OutputBanSubstrings,
-        Toxicity as OutputToxicity,
-        MaliciousURLs,
-        NoRefusal,
-        Code as OutputCode,
-    )
-    from llm_guard.vault import Vault
-    from llm_guard import scan_prompt, scan_output
-    
+# llm-guard (and the transformers/torch stack behind it) is imported lazily on
+# first scanner initialization, so workers with guards disabled never load it.
+HAS_LLM_GUARD = importlib.util.find_spec('llm_guard') is not None
+_LLM_GUARD_LOADED = False
+
+# Placeholders until _load_llm_guard() runs
+InputBanSubstrings = PromptInjection = InputToxicity = Secrets = None
+InputCode = TokenLimit = Anonymize = None
+OutputBanSubstrings = OutputToxicity = MaliciousURLs = NoRefusal = OutputCode = None
+Vault = None
+scan_prompt = None
+scan_output = None
+# Model configuration placeholders
+DEBERTA_AI4PRIVACY_v2_CONF = None
+CODE_MODEL = PROMPT_INJECTION_MODEL = TOXICITY_MODEL = MALICIOUS_URLS_MODEL = NO_REFUSAL_MODEL = None
+
+
+def _load_llm_guard() -> bool:
+    """Import llm-guard scanners on first use. Returns True when llm-guard is usable."""
+    global HAS_LLM_GUARD, _LLM_GUARD_LOADED
+    global InputBanSubstrings, PromptInjection, InputToxicity, Secrets, InputCode, Anonymize
+    global OutputBanSubstrings, OutputToxicity, MaliciousURLs, NoRefusal, OutputCode
+    global Vault, scan_prompt, scan_output
+    global DEBERTA_AI4PRIVACY_v2_CONF, CODE_MODEL, PROMPT_INJECTION_MODEL, TOXICITY_MODEL
+    global MALICIOUS_URLS_MODEL, NO_REFUSAL_MODEL
+
+    if _LLM_GUARD_LOADED or not HAS_LLM_GUARD:
+        return HAS_LLM_GUARD
+    _LLM_GUARD_LOADED = True
+
+    try:
+        from llm_guard.input_scanners import (
+            BanSubstrings as InputBanSubstrings,
+            PromptInjection,
+            Toxicity as InputToxicity,
+            Secrets,
+            Code as InputCode,
+            Anonymize,
+        )
+        from llm_guard.output_scanners import (
+            BanSubstrings as OutputBanSubstrings,
+            Toxicity as OutputToxicity,
+            MaliciousURLs,
+            NoRefusal,
+            Code as OutputCode,
+        )
+        from llm_guard.vault import Vault
+        from llm_guard import scan_prompt, scan_output
+    except ImportError as e:
+        logger.warning('Failed to import llm-guard modules; guard features will be disabled: %s', e)
+        HAS_LLM_GUARD = False
+        return False
+
     # Import model configurations for local model support (optional - may not exist in all versions)
     # Use same models for both input and output scanners
-    DEBERTA_AI4PRIVACY_v2_CONF = None
-    CODE_MODEL = None
-    PROMPT_INJECTION_MODEL = None
-    TOXICITY_MODEL = None
-    MALICIOUS_URLS_MODEL = None
-    NO_REFUSAL_MODEL = None
-    
     try:
         from llm_guard.input_scanners.anonymize_helpers import DEBERTA_AI4PRIVACY_v2_CONF
     except (ImportError, AttributeError):
         pass
-    
+
     try:
         from llm_guard.input_scanners.code import DEFAULT_MODEL as CODE_MODEL
     except (ImportError, AttributeError):
         pass
-    
+
     try:
         from llm_guard.input_scanners.prompt_injection import V2_MODEL as PROMPT_INJECTION_MODEL
     except (ImportError, AttributeError):
         pass
-    
+
     try:
         from llm_guard.input_scanners.toxicity import DEFAULT_MODEL as TOXICITY_MODEL
     except (ImportError, AttributeError):
         pass
-    
+
     try:
         from llm_guard.output_scanners.malicious_urls import DEFAULT_MODEL as MALICIOUS_URLS_MODEL
     except (ImportError, AttributeError):
@@ -69,24 +99,23 @@ try:
         from llm_guard.output_scanners.no_refusal import DEFAULT_MODEL as NO_REFUSAL_MODEL
     except (ImportError, AttributeError):
         pass
-    
-    HAS_LLM_GUARD = True
+
     logger.info('llm-guard modules imported successfully')
-    
-except ImportError as e:
-    logger.warning('Failed to import llm-guard modules; guard features will be disabled: %s', e)
-    HAS_LLM_GUARD = False
-    # Define placeholder classes if llm-guard is not available
-    InputBanSubstrings = PromptInjection = InputToxicity = Secrets = None
-    InputCode = TokenLimit = Anonymize = None
-    OutputBanSubstrings = OutputToxicity = MaliciousURLs = NoRefusal = OutputCode = None
-    Vault = None
-    scan_prompt = None
-    scan_output = None
-    # Model configuration placeholders
-    DEBERTA_AI4PRIVACY_v2_CONF = None
-    CODE_MODEL = PROMPT_INJECTION_MODEL = TOXICITY_MODEL = MALICIOUS_URLS_MODEL = NO_REFUSAL_MODEL = None
- 
+    return True
+
+
+@lru_cache(maxsize=1)
+def _probe_mps() -> Optional[bool]:
+    """Return whether torch reports MPS as available (None if torch is missing).
+
+    The driver query is done once per process; it cannot change at runtime.
+    """
+    try:
+        import torch
+        return bool(hasattr(torch.backends, 'mps') and torch.backends.mps.is_available())
+    except (ImportError, AttributeError):
+        return None
+
 
 class LLMGuardManager:
     def __init__(
@@ -132,6 +161,12 @@ class LLMGuardManager:
         self.enable_input_code_scanner = bool(enable_input_code_scanner) and HAS_LLM_GUARD
         self.scan_fail_fast = os.environ.get('LLM_GUARD_FAST_FAIL', 'true').lower() in ('1', 'true', 'yes', 'on')
         logger.info(f'Fast fail enabled: {self.scan_fail_fast}')
+        # Cap concurrent ML scans independently of upstream request concurrency
+        try:
+            self.max_concurrent_scans = max(1, int(os.environ.get('LLM_GUARD_MAX_CONCURRENT_SCANS', '2')))
+        except ValueError:
+            self.max_concurrent_scans = 2
+        self._scan_semaphore: Optional[asyncio.Semaphore] = None
         # Lazy initialization flags
         self._initialized = False
         self._input_scanners_initialized = False
@@ -182,21 +217,24 @@ class LLMGuardManager:
         elif device_override:
             logger.warning(f'Invalid device override "{device_override}" - must be "cpu" or "mps"')
         
+        # With no scanners enabled nothing runs on the device; skip importing torch
+        if not (self.enable_input or self.enable_output):
+            return 'cpu'
+        
         system = platform.system()
         machine = platform.machine()
         cpu_count = os.cpu_count() or 1
         
         # Auto-detect Apple Silicon MPS
         if machine == 'arm64' and system == 'Darwin':
-            try:
-                import torch
-                if hasattr(torch.backends, 'mps') and torch.backends.mps.is_available():
-                    logger.info(f'Apple Silicon detected - Using MPS GPU acceleration (System: {system}, Machine: {machine}, Cores: {cpu_count})')
-                    return 'mps'
-                else:
-                    logger.info(f'Apple Silicon detected but MPS not available - Using CPU (System: {system}, Machine: {machine}, Cores: {cpu_count})')
-                    return 'cpu'
-            except (ImportError, AttributeError):
+            mps_available = _probe_mps()
+            if mps_available:
+                logger.info(f'Apple Silicon detected - Using MPS GPU acceleration (System: {system}, Machine: {machine}, Cores: {cpu_count})')
+                return 'mps'
+            elif mps_available is False:
+                logger.info(f'Apple Silicon detected but MPS not available - Using CPU (System: {system}, Machine: {machine}, Cores: {cpu_count})')
+                return 'cpu'
+            else:
                 logger.info(f'Apple Silicon detected but torch not available - Using CPU (System: {system}, Machine: {machine}, Cores: {cpu_count})')
                 return 'cpu'
         
@@ -204,6 +242,12 @@ class LLMGuardManager:
         logger.info(f'Using CPU for ML inference - System: {system}, Machine: {machine}, Cores: {cpu_count}')
         return 'cpu'
     
+    def get_device_memory_stats(self) -> Dict[str, float]:
+        """Memory usage of the compute device (MPS only; empty on CPU)."""
+        if self.device != 'mps':
+            return {}
+        return get_mps_memory_stats()
+
     def _check_local_models_config(self) -> bool:
         """Check if local models should be used based on environment variables."""
         use_local = os.environ.get('LLM_GUARD_USE_LOCAL_MODELS', '').lower() in ('1', 'true', 'yes', 'on')
@@ -244,6 +288,14 @@ class LLMGuardManager:
         if self._initialized:
             return
         
+        if not (self.enable_input or self.enable_output or self.enable_anonymize):
+            self._initialized = True
+            return
+        
+        if not _load_llm_guard():
+            self._disable_guards()
+            return
+        
         # Configure local models if enabled
         if self.use_local_models:
             self._configure_local_models_in()
@@ -266,6 +318,13 @@ class LLMGuardManager:
         self._initialized = True
         logger.info('LLM Guard Manager fully initialized')
     
+    def _disable_guards(self):
+        """Turn off all guard features after llm-guard failed to import."""
+        self.enable_input = False
+        self.enable_output = False
+        self.enable_anonymize = False
+        self.enable_input_code_scanner = False
+
     def _ensure_input_scanners_initialized(self):
         """Ensure input scanners are initialized (lazy loading)."""
         if self._input_scanners_initialized:
@@ -274,6 +333,10 @@ class LLMGuardManager:
         if not self.enable_input or not HAS_LLM_GUARD:
             return
         
+        if not _load_llm_guard():
+            self._disable_guards()
+            return
+        
         logger.info('Lazy initializing input scanners...')
         
         # Configure local models if needed
@@ -301,6 +364,10 @@ class LLMGuardManager:
         if not self.enable_output or not HAS_LLM_GUARD:
             return
         
+        if not _load_llm_guard():
+            self._disable_guards()
+            return
+        
         logger.info('Lazy initializing output scanners...')
         
         # Configure local models if needed
@@ -621,6 +688,12 @@ class LLMGuardManager:
             logger.exception('Failed to init output scanners: %s', e)
             self.output_scanners = []
 
+    def _get_scan_semaphore(self) -> asyncio.Semaphore:
+        """Return the semaphore limiting concurrent scanner threads (created lazily on the running loop)."""
+        if self._scan_semaphore is None:
+            self._scan_semaphore = asyncio.Semaphore(self.max_concurrent_scans)
+        return self._scan_semaphore
+
     async def _run_input_scanners(self, prompt: str) -> Tuple[str, bool, Dict[str, Any]]:
         """
         Run all input scanners on the prompt using scan_prompt function.
@@ -632,12 +705,13 @@ class LLMGuardManager:
         
         try:
             # Use scan_prompt with input scanners in a thread (llm-guard best practice)
-            sanitized_prompt, results_valid, results_score = await asyncio.to_thread(
-                scan_prompt,
-                self.input_scanners,
-                prompt,
-                self.scan_fail_fast
-            )
+            async with self._get_scan_semaphore():
+                sanitized_prompt, results_valid, results_score = await asyncio.to_thread(
+                    scan_prompt,
+                    self.input_scanners,
+                    prompt,
+                    self.scan_fail_fast
+                )
             
             # Convert results to expected format
             scan_results = {}
@@ -651,7 +725,7 @@ class LLMGuardManager:
                 }
                 
                 if not is_valid:
-                    logger.warning(f'Scanner {scanner_name} failed: risk_score={risk_score:.2f}%')
+                    logger.warning('Scanner %s failed: risk_score=%.2f%%', scanner_name, risk_score)
             
             all_valid = all(results_valid.values())
             return sanitized_prompt, all_valid, scan_results
@@ -674,13 +748,14 @@ class LLMGuardManager:
         try:
             # Use scan_output with output scanners in a thread (llm-guard best practice)
             # Signature: scan_output(scanners, prompt, output, fail_fast)
-            sanitized_output, results_valid, results_score = await asyncio.to_thread(
-                scan_output,
-                self.output_scanners,
-                "",  # Skip prompt to minimize token usage during output scans
-                text,
-                self.scan_fail_fast
-            )
+            async with self._get_scan_semaphore():
+                sanitized_output, results_valid, results_score = await asyncio.to_thread(
+                    scan_output,
+                    self.output_scanners,
+                    "",  # Skip prompt to minimize token usage during output scans
+                    text,
+                    self.scan_fail_fast
+                )
             
             # Convert results to expected format
             scan_results = {}
@@ -694,7 +769,7 @@ class LLMGuardManager:
                 }
                 
                 if not is_valid:
-                    logger.warning(f'Scanner {scanner_name} failed: risk_score={risk_score:.2f}%')
+                    logger.warning('Scanner %s failed: risk_score=%.2f%%', scanner_name, risk_score)
             
             all_valid = all(results_valid.values())
             return sanitized_output, all_valid, scan_results
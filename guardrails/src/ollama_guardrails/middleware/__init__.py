@@ -3,14 +3,18 @@ Middleware components for request/response processing.
 
 This package contains middleware for:
 - HTTP client management
-- Request/response filtering
+- Request/response filtering (access logging, reverse proxy headers)
 """
 
 from __future__ import annotations
 
-from .http_client import close_http_client, get_http_client
+from .http_client import close_http_client, get_http_client, get_inflight_limiter, read_json_body
+from .proxy_request import ProxyRequestMiddleware
 
 __all__ = [
     "get_http_client", 
     "close_http_client",
+    "get_inflight_limiter",
+    "read_json_body",
+    "ProxyRequestMiddleware",
 ]
\ No newline at end of file
@@ -1,12 +1,16 @@
 """HTTP client management for Ollama Guard Proxy with tuning helpers."""
 
+import asyncio
 import importlib
 import json
 import logging
 import os
-from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Optional, Tuple, Union
 
 import httpx
+import orjson
+from fastapi import HTTPException
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +18,10 @@ logger = logging.getLogger(__name__)
 _HTTP_CLIENT: Optional[httpx.AsyncClient] = None
 _TRUST_ENV_DEFAULT = False
 
+# Bound on concurrent upstream generations (local Ollama rarely batches)
+_INFLIGHT_LIMITER: Optional[asyncio.Semaphore] = None
+_DEFAULT_MAX_INFLIGHT = 4
+
 _DEFAULT_MAX_CONNECTIONS = 200
 _DEFAULT_KEEPALIVE_EXPIRY = 45.0
 _DEFAULT_READ_TIMEOUT = 1_200.0
@@ -108,6 +116,20 @@ def _json_stream(payload: Any, chunk_size: int) -> AsyncIterator[bytes]:
     return _generator()
 
 
+# Default per-request timeout for forwarded calls (300s for every phase, as
+# before), built once instead of per request
+_DEFAULT_REQUEST_TIMEOUT = httpx.Timeout(300.0)
+
+
+@lru_cache(maxsize=16)
+def _request_timeout(seconds: float) -> httpx.Timeout:
+    """Return a shared httpx.Timeout for a numeric timeout (callers use a handful of values)."""
+    return httpx.Timeout(seconds)
+
+
+_RAW_JSON_HEADERS = {"Accept": "application/json", "Content-Type": "application/json"}
+
+
 def _prepare_payload(payload: Any) -> Dict[str, Any]:
     headers = {"Accept": "application/json"}
     if payload is None:
@@ -197,6 +219,22 @@ def get_http_client(max_pool: int = 100) -> httpx.AsyncClient:
     return _HTTP_CLIENT
 
 
+def get_inflight_limiter() -> asyncio.Semaphore:
+    """
+    Get or create the semaphore bounding concurrent upstream requests.
+
+    Requests beyond ``MAX_INFLIGHT`` (default 4) queue on the proxy instead of
+    piling extra generations and long-lived connections onto Ollama. Created
+    lazily so it binds to the running event loop.
+    """
+    global _INFLIGHT_LIMITER
+    if _INFLIGHT_LIMITER is None:
+        max_inflight = max(1, _env_int("MAX_INFLIGHT", _DEFAULT_MAX_INFLIGHT))
+        _INFLIGHT_LIMITER = asyncio.Semaphore(max_inflight)
+        logger.info("Upstream in-flight limit set to %d", max_inflight)
+    return _INFLIGHT_LIMITER
+
+
 async def close_http_client():
     """Close the HTTP client on shutdown."""
     global _HTTP_CLIENT
@@ -205,18 +243,52 @@ async def close_http_client():
         _HTTP_CLIENT = None
 
 
-async def safe_json(response: httpx.Response) -> Tuple[Optional[dict], Optional[str]]:
+def safe_json(response: httpx.Response) -> Tuple[Optional[dict], Optional[str]]:
     """Safely parse JSON from httpx.Response.
 
     Returns (data, error_message). Only one of them will be non-None.
+    Parses with orjson; falls back to httpx's decoder for non-UTF-8 bodies
+    and to report its descriptive error message.
     """
+    try:
+        return orjson.loads(response.content), None
+    except Exception:
+        pass
     try:
         return response.json(), None
     except Exception as e:
         return None, str(e)
 
 
-async def forward_request(config, path: str, payload: Any = None, stream: bool = False, timeout: int = 300):
+async def read_json_body(request) -> Tuple[Any, bytes]:
+    """Read and parse an incoming JSON request body with orjson.
+
+    Returns (payload, raw_body) so pass-through endpoints can forward the
+    original bytes upstream instead of re-serializing the payload.
+    Raises HTTPException(400, invalid_json) when the body is not valid JSON.
+    """
+    body = await request.body()
+    try:
+        return orjson.loads(body), body
+    except orjson.JSONDecodeError as exc:
+        logger.warning("Invalid request JSON on %s: %s", request.url.path, exc)
+        raise HTTPException(status_code=400, detail={"error": "invalid_json", "message": str(exc)})
+
+
+@lru_cache(maxsize=64)
+def _upstream_url(base_url: str, path: str) -> str:
+    """Join the Ollama base URL and an API path (memoized; both are fixed per deployment)."""
+    return f"{base_url.rstrip('/')}{path}"
+
+
+async def forward_request(
+    config,
+    path: str,
+    payload: Any = None,
+    stream: bool = False,
+    timeout: Union[float, httpx.Timeout, None] = None,
+    body: Optional[bytes] = None,
+):
     """
     Forward a request to the Ollama backend with reverse proxy support.
 
@@ -234,16 +306,25 @@ async def forward_request(config, path: str, payload: Any = None, stream: bool =
         path: API path
         payload: Request payload
         stream: Whether to stream the response
-        timeout: Request timeout in seconds
+        timeout: Request timeout in seconds or an httpx.Timeout
+            (default: 300s)
+        body: Raw JSON request body; when given it is sent as-is instead of
+            serializing ``payload`` (which is then only used for logging)
     """
-    ollama_url = config.get('ollama_url')
-    full = f"{ollama_url.rstrip('/')}{path}"
-    payload_plan = _prepare_payload(payload)
+    full = _upstream_url(config.get('ollama_url'), path)
+    if timeout is None:
+        timeout = _DEFAULT_REQUEST_TIMEOUT
+    elif not isinstance(timeout, httpx.Timeout):
+        timeout = _request_timeout(timeout)
+    if body is not None:
+        payload_plan = {"headers": _RAW_JSON_HEADERS, "json": None, "content": body}
+    else:
+        payload_plan = _prepare_payload(payload)
     headers = payload_plan["headers"]
 
     try:
         client = get_http_client()
-        if payload is None:
+        if payload is None and body is None:
             resp = await client.get(full, headers=headers, timeout=timeout)
             return resp, None
 
@@ -264,7 +345,7 @@ async def forward_request(config, path: str, payload: Any = None, stream: bool =
         method = request.method if request else ("GET" if payload is None else "POST")
         target_url = str(request.url) if request and request.url else full
         logger.error(
-            "HTTPX request error [%s %s] (timeout=%ss): %s | payload=%s",
+            "HTTPX request error [%s %s] (timeout=%s): %s | payload=%s",
             method,
             target_url,
             timeout,
@@ -0,0 +1,80 @@
+"""Pure ASGI request middleware: access logging and reverse proxy headers."""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Iterable, Optional
+
+from starlette.datastructures import MutableHeaders
+
+logger = logging.getLogger(__name__)
+
+_VIA_NAME = "Ollama-Guardrails/1.0"
+_DEFAULT_SKIP_LOG_PATHS = frozenset({"/health", "/favicon.ico", "/metrics"})
+# Probe paths handed straight to the app: no Via header, timing or logging
+_DEFAULT_BYPASS_PATHS = frozenset({"/health"})
+
+
+class ProxyRequestMiddleware:
+    """
+    Single ASGI middleware replacing the per-request ``@app.middleware("http")`` pair.
+
+    - Appends this proxy to the ``Via`` header for reverse proxy chain visibility
+    - Logs slow (>1s to first byte) or failed requests when access logging is enabled
+    - Passes liveness probe paths (``/health``) through untouched, since they
+      are the most frequent requests and nobody reads their Via header or logs
+
+    Unlike ``BaseHTTPMiddleware`` it does not spawn a task or re-wrap the
+    response body, so streaming responses pass straight through.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        enable_access_log: bool = False,
+        skip_log_paths: Optional[Iterable[str]] = None,
+        bypass_paths: Optional[Iterable[str]] = None,
+    ):
+        self.app = app
+        self.enable_access_log = enable_access_log
+        self.skip_log_paths = frozenset(skip_log_paths) if skip_log_paths is not None else _DEFAULT_SKIP_LOG_PATHS
+        self.bypass_paths = frozenset(bypass_paths) if bypass_paths is not None else _DEFAULT_BYPASS_PATHS
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.bypass_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        path = scope["path"]
+        log_enabled = self.enable_access_log and path not in self.skip_log_paths
+
+        if log_enabled and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Request: %s %s", method, path)
+
+        start_ts = time.perf_counter()
+        status_code = 0
+        duration_ms: Optional[int] = None
+
+        async def send_wrapper(message):
+            nonlocal status_code, duration_ms
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                duration_ms = int((time.perf_counter() - start_ts) * 1000)
+                headers = MutableHeaders(scope=message)
+                via = headers.get("Via", "")
+                headers["Via"] = f"{via}, {_VIA_NAME}" if via else f"1.1 {_VIA_NAME}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if log_enabled:
+                if duration_ms is None:
+                    duration_ms = int((time.perf_counter() - start_ts) * 1000)
+                # Log slow requests (>1000ms) or errors at WARNING level
+                if duration_ms > 1000 or status_code >= 400 or status_code == 0:
+                    logger.warning("Slow/Error: %s %s -> %s (%d ms)", method, path, status_code, duration_ms)
+                elif logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Response: %s (%d ms)", status_code, duration_ms)
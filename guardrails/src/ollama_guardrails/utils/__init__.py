@@ -20,6 +20,7 @@ from .utils import (
     extract_prompt_from_completion_payload,
     extract_text_from_payload,
     extract_text_from_response,
+    new_completion_id,
 )
 from .tiktoken_cache import (
     setup_tiktoken_offline_mode,
@@ -45,6 +46,7 @@ from .device_config import (
     is_gpu_mode,
     setup_transformers_cpu,
     get_recommended_config,
+    get_mps_memory_stats,
 )
 from .guard_responses import (
     inline_guard_errors_enabled,
@@ -59,6 +61,7 @@ __all__ = [
     "combine_messages_text",
     "build_ollama_options_from_openai_payload",
     "extract_prompt_from_completion_payload",
+    "new_completion_id",
     "get_language_message",
     "setup_tiktoken_offline_mode",
     "ensure_tiktoken_cache_dir",
@@ -79,6 +82,7 @@ __all__ = [
     "is_gpu_mode",
     "setup_transformers_cpu",
     "get_recommended_config",
+    "get_mps_memory_stats",
     "inline_guard_errors_enabled",
     "extract_failed_scanners",
     "format_markdown_error",
@@ -29,6 +29,29 @@ PSUTIL_AVAILABLE = psutil is not None
 
 logger = logging.getLogger(__name__)
 
+_STATM_PATH = "/proc/self/statm"
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _fast_rss_bytes(process=None) -> Optional[int]:
+    """
+    Resident set size of this process in bytes.
+    
+    Reads /proc/self/statm directly on Linux (no psutil object construction);
+    falls back to psutil's memory_info() elsewhere.
+    """
+    try:
+        with open(_STATM_PATH, "rb") as statm:
+            return int(statm.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        pass
+    if process is not None:
+        try:
+            return process.memory_info().rss
+        except Exception:
+            return None
+    return None
+
 
 class ConcurrencyMonitor:
     """Monitor concurrent connections and tasks in real-time."""
@@ -48,7 +71,8 @@ class ConcurrencyMonitor:
         self.active_tasks: Dict[str, int] = defaultdict(int)  # endpoint -> count
         self.completed_tasks: Dict[str, int] = defaultdict(int)  # endpoint -> count
         self.queue_depth = 0
-        self.start_time = time.time()
+        self._active_total = 0  # running sum of active_tasks, kept under lock
+        self.start_time = time.monotonic()  # uptime only; immune to wall-clock steps
         self.lock = threading.Lock()
         self.monitor_thread: Optional[threading.Thread] = None
         self.is_running = False
@@ -88,14 +112,16 @@ class ConcurrencyMonitor:
             self.total_requests += count
             
             # Update peak concurrent
-            current_total = sum(self.active_tasks.values())
+            self._active_total += count
+            current_total = self._active_total
             if current_total > self.peak_concurrent:
                 self.peak_concurrent = current_total
-                
-            if self.enable_debug and count > 0:
-                logger.debug(f"Task increment: {endpoint} (+{count}), "
-                           f"Total active: {current_total}, "
-                           f"Peak: {self.peak_concurrent}")
+            peak = self.peak_concurrent
+        
+        # Log outside the lock so formatting never delays other requests
+        if self.enable_debug and count > 0:
+            logger.debug("Task increment: %s (+%d), Total active: %d, Peak: %d",
+                         endpoint, count, current_total, peak)
         
     def decrement_task(self, endpoint: str, count: int = 1, success: bool = True) -> None:
         """
@@ -107,19 +133,22 @@ class ConcurrencyMonitor:
             success: Whether the task completed successfully (default: True)
         """
         with self.lock:
-            self.active_tasks[endpoint] = max(0, self.active_tasks[endpoint] - count)
+            previous = self.active_tasks[endpoint]
+            remaining = max(0, previous - count)
+            self.active_tasks[endpoint] = remaining
+            self._active_total -= previous - remaining
             self.completed_tasks[endpoint] += count
             
             if not success:
                 self.failed_requests += count
                 
-            current_total = sum(self.active_tasks.values())
-            
-            if self.enable_debug and count > 0:
-                status = "✓" if success else "✗"
-                logger.debug(f"Task complete: {endpoint} {status} (-{count}), "
-                           f"Total active: {current_total}, "
-                           f"Completed: {self.completed_tasks[endpoint]}")
+            current_total = self._active_total
+            completed = self.completed_tasks[endpoint]
+        
+        if self.enable_debug and count > 0:
+            status = "✓" if success else "✗"
+            logger.debug("Task complete: %s %s (-%d), Total active: %d, Completed: %d",
+                         endpoint, status, count, current_total, completed)
         
     def set_queue_depth(self, depth: int) -> None:
         """
@@ -139,8 +168,8 @@ class ConcurrencyMonitor:
             Dictionary with concurrency metrics
         """
         with self.lock:
-            current_active = sum(self.active_tasks.values())
-            uptime = time.time() - self.start_time
+            current_active = self._active_total
+            uptime = time.monotonic() - self.start_time
             
             return {
                 'current_active': current_active,
@@ -160,6 +189,9 @@ class ConcurrencyMonitor:
         if PSUTIL_AVAILABLE and psutil is not None:
             try:
                 process = psutil.Process(os.getpid())
+                # Prime the CPU counters; later non-blocking calls report the
+                # usage since the previous sample (one update_interval)
+                process.cpu_percent(interval=None)
             except Exception as e:  # pragma: no cover - diagnostics only
                 logger.warning(f"Could not access process metrics: {e}")
                 process = None
@@ -193,12 +225,15 @@ class ConcurrencyMonitor:
                     # Log process metrics if available
                     if process and PSUTIL_AVAILABLE:
                         try:
-                            cpu_percent = process.cpu_percent(interval=0.1)
-                            memory_info = process.memory_info()
-                            memory_mb = memory_info.rss / 1024 / 1024
+                            # oneshot() batches the /proc reads behind these calls
+                            with process.oneshot():
+                                cpu_percent = process.cpu_percent(interval=None)
+                                rss_bytes = _fast_rss_bytes(process)
+                                num_threads = process.num_threads()
+                            memory_mb = (rss_bytes or 0) / 1024 / 1024
                             logger.debug(f"[SYSTEM] CPU: {cpu_percent:.1f}% | "
                                        f"Memory: {memory_mb:.1f}MB | "
-                                       f"Threads: {process.num_threads()}")
+                                       f"Threads: {num_threads}")
                         except Exception:
                             pass
                 
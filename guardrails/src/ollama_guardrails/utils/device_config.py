@@ -14,6 +14,7 @@ Usage:
 """
 
 import os
+import sys
 import logging
 from typing import Dict
 
@@ -191,6 +192,43 @@ def is_gpu_mode() -> bool:
     return device in ('mps', 'cuda', 'gpu')
 
 
+def get_mps_memory_stats() -> Dict[str, float]:
+    """
+    Get Apple Silicon (MPS) memory usage in MB from torch.mps.
+    
+    Only reports when torch has already been imported by the ML stack, so
+    calling this never pulls torch into a process that does not use it.
+    Fields missing from older torch releases are omitted.
+    
+    Returns:
+        Dictionary with allocated/driver/recommended-max memory (may be empty)
+    
+    Example:
+        >>> from ollama_guardrails.utils.device_config import get_mps_memory_stats
+        >>> get_mps_memory_stats()
+        {'memory_allocated_mb': 512.0, 'memory_driver_mb': 1024.0, ...}
+    """
+    torch = sys.modules.get('torch')
+    mps = getattr(torch, 'mps', None) if torch is not None else None
+    if mps is None:
+        return {}
+    
+    stats: Dict[str, float] = {}
+    for key, func_name in (
+        ('memory_allocated_mb', 'current_allocated_memory'),
+        ('memory_driver_mb', 'driver_allocated_memory'),
+        ('memory_recommended_max_mb', 'recommended_max_memory'),
+    ):
+        func = getattr(mps, func_name, None)
+        if func is None:
+            continue
+        try:
+            stats[key] = round(func() / (1024 ** 2), 2)
+        except Exception as exc:  # MPS backend unavailable on this machine
+            logger.debug('torch.mps.%s failed: %s', func_name, exc)
+    return stats
+
+
 def setup_transformers_cpu() -> None:
     """
     Additional configuration specifically for Hugging Face transformers.
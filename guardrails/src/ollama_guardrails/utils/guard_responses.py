@@ -35,7 +35,7 @@ def inline_guard_errors_enabled(config: Any, default: bool = True) -> bool:
     env_value = os.environ.get('INLINE_GUARD_ERRORS')
     if env_value is not None:
         result = _coerce_bool(env_value, default)
-        logger.debug(f"inline_guard_errors_enabled: INLINE_GUARD_ERRORS={env_value} -> {result}")
+        logger.debug("inline_guard_errors_enabled: INLINE_GUARD_ERRORS=%s -> %s", env_value, result)
         return result
     
     # Then check config
@@ -49,7 +49,7 @@ def inline_guard_errors_enabled(config: Any, default: bool = True) -> bool:
         candidate = default
     
     result = _coerce_bool(candidate, default)
-    logger.debug(f"inline_guard_errors_enabled: config value={candidate} -> {result}")
+    logger.debug("inline_guard_errors_enabled: config value=%s -> %s", candidate, result)
     return result
 
 
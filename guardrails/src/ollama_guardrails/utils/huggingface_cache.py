@@ -168,7 +168,8 @@ def get_huggingface_cache_info() -> Dict[str, Any]:
     }
 
 
-def download_huggingface_model(model_id: str, cache_dir: Optional[str] = None) -> bool:
+def download_huggingface_model(model_id: str, cache_dir: Optional[str] = None,
+                               configure_env: bool = True) -> bool:
     """
     Download a specific Hugging Face model locally.
     
@@ -178,6 +179,9 @@ def download_huggingface_model(model_id: str, cache_dir: Optional[str] = None) -
     Args:
         model_id: Hugging Face model ID (e.g., 'bert-base-uncased')
         cache_dir: Cache directory (default: from HF_HOME env var)
+        configure_env: Call setup_huggingface_offline_mode() first. Pass False
+            when it has already run, e.g. for downloads on worker threads,
+            which must not write os.environ concurrently
     
     Returns:
         bool: True if model was successfully cached, False otherwise
@@ -188,7 +192,8 @@ def download_huggingface_model(model_id: str, cache_dir: Optional[str] = None) -
     """
     try:
         # Setup offline mode first
-        setup_huggingface_offline_mode(cache_dir)
+        if configure_env:
+            setup_huggingface_offline_mode(cache_dir)
         
         # Import transformers after environment setup
         try:
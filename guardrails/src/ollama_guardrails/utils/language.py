@@ -1,6 +1,6 @@
 import re
 import logging
-from typing import Dict
+from typing import Dict, Tuple
 
 try:
     from langdetect import detect as langdetect_detect
@@ -16,6 +16,18 @@ except ImportError:  # pragma: no cover - optional dependency
 logger = logging.getLogger(__name__)
 
 
+def _split_reason_templates(messages_by_lang: Dict[str, Dict[str, str]]) -> Dict[str, Dict[str, Tuple[str, str]]]:
+    """Pre-split '{reason}' templates into (head, tail) pairs, keyed by language then message."""
+    templates: Dict[str, Dict[str, Tuple[str, str]]] = {}
+    for code, messages in messages_by_lang.items():
+        templates[code] = {}
+        for key, template in messages.items():
+            if '{reason}' in template:
+                head, _, tail = template.partition('{reason}')
+                templates[code][key] = (head, tail)
+    return templates
+
+
 class LanguageDetector:
     """Detect language from text and provide localized error messages."""
     LANGUAGE_PATTERNS = {
@@ -36,6 +48,12 @@ class LanguageDetector:
     }
     SUPPORTED_LANG_CODES = {'en', 'zh', 'vi', 'ja', 'ko', 'ru', 'ar', 'fr', 'de', 'es', 'pt'}
     ENGLISH_PATTERN = re.compile(r'\b(the|a|an|and|or|is|are|was|were|be|have|has|had)\b', re.IGNORECASE)
+    # Union of every script pattern: one pass rules out all of them for Latin text
+    _ANY_SCRIPT_PATTERN = re.compile('|'.join(
+        pattern.pattern
+        for lang_info in LANGUAGE_PATTERNS.values()
+        for pattern in lang_info['patterns']
+    ))
 
     _BASE_MESSAGES = {
         'prompt_blocked': 'Your input was blocked by the security scanner. Reason: {reason}',
@@ -159,17 +177,22 @@ class LanguageDetector:
         else:
             ERROR_MESSAGES.setdefault(code, _BASE_MESSAGES)
 
+    # Pre-split '{reason}' templates so error paths concatenate instead of calling str.format
+    _REASON_TEMPLATES = _split_reason_templates(ERROR_MESSAGES)
+
     @staticmethod
     def detect_language(text: str) -> str:
         if not text:
             return 'en'
 
-        # Quick regex-based detection for a handful of languages
-        for lang_code, lang_info in LanguageDetector.LANGUAGE_PATTERNS.items():
-            for pattern in lang_info['patterns']:
-                if pattern.search(text):
-                    logger.info("Detected language: %s", lang_info['name'])
-                    return lang_code
+        # Quick regex-based detection for a handful of languages; the per-language
+        # scans (which keep their priority order) only run if some script matched
+        if LanguageDetector._ANY_SCRIPT_PATTERN.search(text):
+            for lang_code, lang_info in LanguageDetector.LANGUAGE_PATTERNS.items():
+                for pattern in lang_info['patterns']:
+                    if pattern.search(text):
+                        logger.info("Detected language: %s", lang_info['name'])
+                        return lang_code
 
         # Use langdetect if available for broader coverage
         if LANGDETECT_AVAILABLE and langdetect_detect is not None:
@@ -181,8 +204,6 @@ class LanguageDetector:
             except LangDetectException as exc:  # pragma: no cover - library raises on short text
                 logger.debug("langdetect failed: %s", exc)
 
-        if LanguageDetector.ENGLISH_PATTERN.search(text):
-            return 'en'
         return 'en'
 
     @staticmethod
@@ -198,11 +219,13 @@ class LanguageDetector:
 
     @staticmethod
     def get_error_message(message_key: str, language: str, reason: str = '') -> str:
-        messages = LanguageDetector.ERROR_MESSAGES.get(language, LanguageDetector.ERROR_MESSAGES['en'])
-        message = messages.get(message_key, '')
-        if reason and '{reason}' in message:
-            message = message.format(reason=reason)
-        return message
+        if language not in LanguageDetector.ERROR_MESSAGES:
+            language = 'en'
+        if reason:
+            parts = LanguageDetector._REASON_TEMPLATES[language].get(message_key)
+            if parts is not None:
+                return parts[0] + reason + parts[1]
+        return LanguageDetector.ERROR_MESSAGES[language].get(message_key, '')
 
 
 def get_language_message(text: str, message_key: str, reason: str = '') -> str:
@@ -107,7 +107,8 @@ def ensure_tiktoken_cache_dir(base_path: str = './models') -> str:
 
 
 def download_tiktoken_encoding(encoding_name: str = 'cl100k_base', 
-                               cache_dir: Optional[str] = None) -> bool:
+                               cache_dir: Optional[str] = None,
+                               configure_env: bool = True) -> bool:
     """
     Download and cache a specific tiktoken encoding locally.
     
@@ -117,6 +118,9 @@ def download_tiktoken_encoding(encoding_name: str = 'cl100k_base',
     Args:
         encoding_name: Name of encoding to download (default: 'cl100k_base')
         cache_dir: Cache directory (default: from TIKTOKEN_CACHE_DIR env var)
+        configure_env: Call setup_tiktoken_offline_mode() first. Pass False when
+            it has already run, e.g. for downloads on worker threads, which
+            must not write os.environ concurrently
     
     Returns:
         bool: True if encoding was successfully cached, False otherwise
@@ -128,7 +132,8 @@ def download_tiktoken_encoding(encoding_name: str = 'cl100k_base',
     """
     try:
         # Setup offline mode first
-        setup_tiktoken_offline_mode(cache_dir)
+        if configure_env:
+            setup_tiktoken_offline_mode(cache_dir)
         
         # Import tiktoken after environment setup
         try:
@@ -5,9 +5,12 @@ Contains helper functions for request/response processing:
 - Text extraction from payloads and responses
 - Message text combining
 - OpenAI to Ollama parameter mapping
+- OpenAI-style completion ID generation
 """
 
+import itertools
 import logging
+import os
 from typing import Dict, Any, Iterable, List, Optional
 
 
@@ -60,33 +63,21 @@ def combine_messages_text(
     if not isinstance(messages, list):
         return ""
 
-    normalized_roles = None
-    if roles is not None:
-        normalized_roles = {role.lower() for role in roles}
-
-    def _matches(msg: Dict[str, Any]) -> bool:
-        if not isinstance(msg, dict):
-            return False
-        if not normalized_roles:
-            return True
-        role = str(msg.get('role', '')).lower()
-        return role in normalized_roles
-
-    if latest_only:
-        for msg in reversed(messages):
-            if not _matches(msg):
-                continue
-            content = msg.get('content')
-            if isinstance(content, str) and content.strip():
-                return content
-        return ""
+    normalized_roles = {role.lower() for role in roles} if roles is not None else None
 
+    # Single fused pass: role filter and content check inline, newest first when
+    # only the latest message is wanted. ``isspace()`` tests for blank content
+    # without copying it the way ``strip()`` does.
     combined: List[str] = []
-    for msg in messages:
-        if not _matches(msg):
+    for msg in (reversed(messages) if latest_only else messages):
+        if not isinstance(msg, dict):
+            continue
+        if normalized_roles and str(msg.get('role', '')).lower() not in normalized_roles:
             continue
         content = msg.get('content')
-        if isinstance(content, str) and content.strip():
+        if isinstance(content, str) and content and not content.isspace():
+            if latest_only:
+                return content
             combined.append(content)
     return "\n".join(combined)
 
@@ -130,3 +121,23 @@ def extract_prompt_from_completion_payload(payload: Dict[str, Any]) -> str:
         return "\n".join(str(item) for item in prompt if isinstance(item, (str, int, float)))
     return str(prompt) if prompt is not None else ""
 
+
+# Completion IDs are a random per-process prefix plus a counter: unique across
+# workers and restarts without drawing fresh entropy (uuid4) for every request.
+_completion_id_prefix = os.urandom(8).hex()
+_completion_id_counter = itertools.count()
+
+
+def _reseed_completion_ids() -> None:
+    global _completion_id_prefix, _completion_id_counter
+    _completion_id_prefix = os.urandom(8).hex()
+    _completion_id_counter = itertools.count()
+
+
+if hasattr(os, "register_at_fork"):  # forked workers must not share the prefix
+    os.register_at_fork(after_in_child=_reseed_completion_ids)
+
+
+def new_completion_id(prefix: str) -> str:
+    """Return an OpenAI-style completion ID, e.g. ``chatcmpl-<32 hex chars>``."""
+    return f"{prefix}-{_completion_id_prefix}{next(_completion_id_counter):016x}"
@@ -0,0 +1,164 @@
+import importlib.util
+from datetime import datetime
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+def _load_admin_module():
+    repo_root = Path(__file__).resolve().parents[4]
+    module_path = repo_root / "guardrails" / "src" / "ollama_guardrails" / "api" / "endpoints_admin.py"
+    spec = importlib.util.spec_from_file_location("endpoints_admin_under_test", str(module_path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class DummyConfig(dict):
+    def get(self, key, default=None):
+        return super().get(key, default)
+
+
+class DummyGuardManager:
+    enable_input = True
+    enable_output = False
+    device = "cpu"
+
+
+def _make_client(guard_manager):
+    module = _load_admin_module()
+    app = FastAPI()
+    app.include_router(module.create_admin_endpoints(DummyConfig(ollama_url="http://ollama:11434"), guard_manager))
+    return TestClient(app)
+
+
+def test_health_body_is_reused_within_ttl():
+    guard_manager = DummyGuardManager()
+    client = _make_client(guard_manager)
+
+    first = client.get("/health")
+    guard_manager.enable_output = True
+    second = client.get("/health")
+
+    assert first.status_code == 200
+    assert first.json()["guards"] == {"input_guard": "enabled", "output_guard": "disabled"}
+    assert first.json()["device"] == "cpu"
+    assert second.content == first.content
+
+
+def test_config_payload():
+    client = _make_client(DummyGuardManager())
+
+    payload = client.get("/config").json()
+
+    assert payload["ollama_url"] == "http://ollama:11434"
+    assert payload["enable_input_guard"] is True
+    assert payload["device"] == "cpu"
+
+
+def test_stats_includes_device_memory_when_reported():
+    guard_manager = DummyGuardManager()
+    guard_manager.get_device_memory_stats = lambda: {"memory_allocated_mb": 12.5}
+    client = _make_client(guard_manager)
+
+    payload = client.get("/stats").json()
+
+    assert payload["guards"]["device_memory"] == {"memory_allocated_mb": 12.5}
+
+
+def test_stats_template_reflects_current_state():
+    guard_manager = DummyGuardManager()
+    reports = [{"memory_allocated_mb": 1.0}, {}]
+    guard_manager.get_device_memory_stats = lambda: reports.pop(0)
+    client = _make_client(guard_manager)
+
+    first = client.get("/stats").json()
+    guard_manager.enable_input = False
+    second = client.get("/stats").json()
+
+    assert first["guards"]["input_enabled"] is True
+    assert "device_memory" in first["guards"]
+    assert second["guards"]["input_enabled"] is False
+    assert "device_memory" not in second["guards"]
+
+
+def test_timestamp_is_formatted_once_per_second(monkeypatch):
+    module = _load_admin_module()
+    monkeypatch.setattr(module.time, "time", lambda: 1_700_000_000.25)
+
+    first = module._timestamp()
+    second = module._timestamp()
+
+    assert first is second
+    assert first == datetime.fromtimestamp(1_700_000_000).isoformat()
+
+
+def test_health_is_a_plain_starlette_route():
+    from fastapi.routing import APIRoute
+
+    module = _load_admin_module()
+    router = module.create_admin_endpoints(DummyConfig(), DummyGuardManager())
+    health_routes = [route for route in router.routes if route.path == "/health"]
+
+    assert health_routes
+    assert not any(isinstance(route, APIRoute) for route in health_routes)
+
+
+def test_health_if_none_match_returns_304():
+    client = _make_client(DummyGuardManager())
+
+    first = client.get("/health")
+    etag = first.headers["etag"]
+    second = client.get("/health", headers={"If-None-Match": etag})
+
+    assert etag.startswith('W/"')
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+    assert first.headers["cache-control"] == "max-age=1, public"
+
+
+def test_health_if_none_match_accepts_lists_and_wildcard():
+    client = _make_client(DummyGuardManager())
+    etag = client.get("/health").headers["etag"]
+
+    listed = client.get("/health", headers={"If-None-Match": f'"stale", {etag}'})
+    strong = client.get("/health", headers={"If-None-Match": etag[2:]})
+    wildcard = client.get("/health", headers={"If-None-Match": "*"})
+    miss = client.get("/health", headers={"If-None-Match": '"stale", W/"other"'})
+
+    assert listed.status_code == 304
+    assert strong.status_code == 304
+    assert wildcard.status_code == 304
+    assert miss.status_code == 200
+
+
+def test_health_etag_ignores_timestamp():
+    module = _load_admin_module()
+    guard_manager = DummyGuardManager()
+    app = FastAPI()
+    app.include_router(module.create_admin_endpoints(DummyConfig(), guard_manager))
+    client = TestClient(app)
+
+    module._timestamp = lambda: "2024-01-01T00:00:00"
+    module._HEALTH_CACHE_TTL = 0.0
+    first = client.get("/health")
+    module._timestamp = lambda: "2024-01-01T00:00:01"
+    second = client.get("/health")
+    guard_manager.enable_output = True
+    third = client.get("/health")
+
+    assert first.json()["timestamp"] != second.json()["timestamp"]
+    assert second.headers["etag"] == first.headers["etag"]
+    assert third.headers["etag"] != first.headers["etag"]
+
+
+def test_snapshot_combines_admin_payloads():
+    client = _make_client(DummyGuardManager())
+
+    snapshot = client.get("/admin/snapshot").json()
+
+    assert snapshot["health"] == client.get("/health").json()
+    assert snapshot["config"] == client.get("/config").json()
+    assert snapshot["stats"]["guards"]["device"] == "cpu"
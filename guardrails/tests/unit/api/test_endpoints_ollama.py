@@ -66,8 +66,10 @@ class DummyGuardManager:
 class DummyResponse:
     def __init__(self, payload):
         self.status_code = 200
+        self.headers = {"content-type": "application/json; charset=utf-8"}
         self._payload = payload
         self.text = json.dumps(payload)
+        self.content = self.text.encode()
 
     def json(self):
         return self._payload
@@ -238,4 +240,110 @@ def test_chat_inline_output_block_returns_markdown(monkeypatch):
     payload = response.json()
     assert "error" in payload, payload
     assert payload["error"]["type"] == "output_blocked"
-    assert "Response blocked" in payload["message"]["content"]
\ No newline at end of file
+    assert "Response blocked" in payload["message"]["content"]
+
+
+def test_tags_passes_upstream_bytes_through(monkeypatch):
+    client = _make_test_client(DummyGuardManager())
+    upstream = DummyResponse({"models": [{"name": "phi"}]})
+    upstream.content = b'{"models":[{"name":"phi"}]}'
+
+    async def fake_forward_request(*args, **kwargs):
+        return upstream, None
+
+    monkeypatch.setattr(endpoints_ollama, "forward_request", fake_forward_request)
+
+    response = client.get("/api/tags")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.content == upstream.content
+
+
+@pytest.mark.parametrize("path", ["/api/embed", "/api/show"])
+def test_json_relay_keeps_status_and_rejects_non_json(monkeypatch, path):
+    client = _make_test_client(DummyGuardManager())
+    upstream = DummyResponse({"embeddings": [[0.1, 0.2]]})
+
+    async def fake_forward_request(*args, **kwargs):
+        return upstream, None
+
+    monkeypatch.setattr(endpoints_ollama, "forward_request", fake_forward_request)
+
+    response = client.post(path, json={"model": "phi", "input": "hello"})
+    assert response.status_code == upstream.status_code
+    assert response.content == upstream.content
+
+    upstream.headers = {"content-type": "text/plain"}
+    upstream.content = b"model runner crashed"
+    response = client.post(path, json={"model": "phi", "input": "hello"})
+    assert response.status_code == 502
+    assert response.json()["detail"]["error"] == "invalid_upstream_response"
+
+
+def test_generate_without_output_guard_relays_upstream_bytes(monkeypatch):
+    client = _make_test_client(DummyGuardManager(), overrides={"enable_output_guard": False})
+    upstream = DummyResponse({"response": "hi", "done": True})
+    upstream.content = b'{"response":"hi","done":true}'
+
+    async def fake_forward_request(*args, **kwargs):
+        return upstream, None
+
+    monkeypatch.setattr(endpoints_ollama, "forward_request", fake_forward_request)
+
+    response = client.post("/api/generate", json={"model": "phi", "prompt": "hello"})
+
+    assert response.status_code == 200
+    assert response.content == upstream.content
+
+
+def test_chat_allowed_output_relays_upstream_bytes(monkeypatch):
+    client = _make_test_client(DummyGuardManager())
+    upstream = DummyResponse({"message": {"role": "assistant", "content": "hi"}, "done": True})
+
+    monkeypatch.setattr(endpoints_ollama, "get_http_client", lambda: DummyHTTPClient(upstream))
+
+    response = client.post(
+        "/api/chat",
+        json={"model": "phi", "messages": [{"role": "user", "content": "hello"}]},
+    )
+
+    assert response.status_code == 200
+    assert response.content == upstream.content
+
+
+def test_generate_relay_rejects_non_json_upstream_body(monkeypatch):
+    client = _make_test_client(DummyGuardManager(), overrides={"enable_output_guard": False})
+    upstream = DummyResponse({})
+    upstream.headers = {"content-type": "text/html"}
+    upstream.content = b"<html>502 Bad Gateway</html>"
+
+    async def fake_forward_request(*args, **kwargs):
+        return upstream, None
+
+    monkeypatch.setattr(endpoints_ollama, "forward_request", fake_forward_request)
+
+    response = client.post("/api/generate", json={"model": "phi", "prompt": "hello"})
+
+    assert response.status_code == 502
+    assert response.json()["detail"]["error"] == "invalid_upstream_response"
+
+
+@pytest.mark.parametrize("enable_output_guard", [True, False])
+def test_chat_relay_rejects_non_json_upstream_body(monkeypatch, enable_output_guard):
+    client = _make_test_client(DummyGuardManager(), overrides={"enable_output_guard": enable_output_guard})
+    upstream = DummyResponse({})
+    upstream.headers = {"content-type": "text/html"}
+    upstream.text = "<html>502 Bad Gateway</html>"
+    upstream.content = upstream.text.encode()
+    upstream.json = lambda: json.loads(upstream.text)
+
+    monkeypatch.setattr(endpoints_ollama, "get_http_client", lambda: DummyHTTPClient(upstream))
+
+    response = client.post(
+        "/api/chat",
+        json={"model": "phi", "messages": [{"role": "user", "content": "hello"}]},
+    )
+
+    assert response.status_code == 502
+    assert response.json()["detail"]["error"] == "invalid_upstream_response"
@@ -1,4 +1,6 @@
+import asyncio
 import importlib.util
+import json
 import sys
 import types
 from pathlib import Path
@@ -75,6 +77,7 @@ class DummyGuardManager:
 class DummyResponse:
     def __init__(self, payload):
         self._payload = payload
+        self.content = json.dumps(payload).encode()
         self.status_code = 200
         self._closed = False
 
@@ -200,4 +203,34 @@ def test_completions_inline_output_block(monkeypatch):
     guard_block = payload.get("guard")
     assert guard_block["type"] == "output_blocked"
     assert guard_block["failed_scanners"][0]["scanner"] == "Toxicity"
-    assert dummy_response.is_closed
\ No newline at end of file
+    assert dummy_response.is_closed
+
+
+@pytest.mark.parametrize(
+    "path, body",
+    [
+        ("/v1/chat/completions", {"model": "gpt-4", "messages": [{"role": "user", "content": "hi"}]}),
+        ("/v1/completions", {"model": "gpt-4", "prompt": "hi"}),
+    ],
+)
+def test_upstream_call_holds_inflight_limiter(monkeypatch, path, body):
+    limiter = asyncio.Semaphore(1)
+    held = []
+
+    class RecordingHTTPClient(DummyHTTPClient):
+        async def post(self, url, json=None, timeout=None):
+            held.append(limiter.locked())
+            return await super().post(url, json=json, timeout=timeout)
+
+    http_client = RecordingHTTPClient(
+        DummyResponse({"message": {"role": "assistant", "content": "ok"}, "response": "ok", "done": True})
+    )
+    client = _make_test_client(monkeypatch, DummyGuardManager(), http_client=http_client)
+    module = sys.modules["ollama_guardrails.api.endpoints_openai"]
+    monkeypatch.setattr(module, "get_inflight_limiter", lambda: limiter)
+
+    response = client.post(path, json=body)
+
+    assert response.status_code == 200
+    assert held == [True]
+    assert not limiter.locked()
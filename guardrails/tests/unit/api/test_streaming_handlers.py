@@ -66,7 +66,10 @@ async def test_stream_response_with_guard_passthrough(monkeypatch):
     ):
         chunks.append(chunk)
 
-    assert chunks == [json.dumps({"response": "safe chunk"}) + "\n", json.dumps({"message": {"content": "more"}}) + "\n"]
+    assert chunks == [
+        json.dumps({"response": "safe chunk"}).encode() + b"\n",
+        json.dumps({"message": {"content": "more"}}).encode() + b"\n",
+    ]
     assert guard_manager.calls == []
     assert response.is_closed
 
@@ -107,3 +110,35 @@ async def test_stream_response_with_guard_blocks_output(monkeypatch):
     assert "Response blocked" in payload["message"]["content"]
     assert guard_manager.calls != []
     assert response.is_closed
+
+
+@pytest.mark.asyncio
+async def test_aiter_ndjson_lines_reassembles_split_chunks():
+    async def body():
+        yield b'{"response": "he'
+        yield b'llo"}\r\n{"done"'
+        yield b': true}'
+
+    request = httpx.Request("POST", "http://test/api")
+    response = httpx.Response(200, request=request, content=body())
+
+    lines = [line async for line in streaming_handlers._aiter_ndjson_lines(response)]
+    assert lines == [b'{"response": "hello"}', b'{"done": true}']
+
+
+@pytest.mark.asyncio
+async def test_aiter_ndjson_lines_handles_long_lines_and_batched_chunks():
+    long_line = b'{"response": "' + b"x" * 50_000 + b'"}'
+
+    async def body():
+        for i in range(0, len(long_line), 7):
+            yield long_line[i:i + 7]
+        yield b'\n{"a": 1}\n{"b": 2}\n{"c"'
+        yield b': 3}\n'
+
+    request = httpx.Request("POST", "http://test/api")
+    response = httpx.Response(200, request=request, content=body())
+
+    lines = [line async for line in streaming_handlers._aiter_ndjson_lines(response)]
+    assert lines == [long_line, b'{"a": 1}', b'{"b": 2}', b'{"c": 3}']
+    assert all(type(line) is bytes for line in lines)
@@ -61,6 +61,7 @@ def stub_guard_env(monkeypatch):
     monkeypatch.setattr(module, "scan_prompt", fake_scan_prompt)
     monkeypatch.setattr(module, "scan_output", fake_scan_output)
     monkeypatch.setattr(module, "HAS_LLM_GUARD", True)
+    monkeypatch.setattr(module, "_LLM_GUARD_LOADED", True)
 
     return module
 
@@ -71,6 +72,19 @@ def test_detect_device_override_cpu(monkeypatch):
     assert manager.device == "cpu"
 
 
+def test_detect_device_skips_torch_probe_when_guards_disabled(monkeypatch):
+    monkeypatch.delenv("LLM_GUARD_DEVICE", raising=False)
+    monkeypatch.setattr(guard_manager.platform, "system", lambda: "Darwin")
+    monkeypatch.setattr(guard_manager.platform, "machine", lambda: "arm64")
+
+    def fail_probe():
+        raise AssertionError("torch should not be probed")
+
+    monkeypatch.setattr(guard_manager, "_probe_mps", fail_probe)
+    manager = guard_manager.LLMGuardManager(enable_input=False, enable_output=False)
+    assert manager.device == "cpu"
+
+
 def test_use_local_models_flag(monkeypatch):
     monkeypatch.setenv("LLM_GUARD_USE_LOCAL_MODELS", "1")
     manager = guard_manager.LLMGuardManager(enable_input=False, enable_output=False)
@@ -194,4 +208,31 @@ def test_configure_local_models_set_paths(stub_guard_env, monkeypatch):
     manager._configure_local_models_in()
     assert guard_manager.PROMPT_INJECTION_MODEL.path.endswith("prompt-injection-v2")
     manager._configure_local_models_out()
-    assert guard_manager.NO_REFUSAL_MODEL.path.endswith("distilroberta-base-rejection-v1")
\ No newline at end of file
+    assert guard_manager.NO_REFUSAL_MODEL.path.endswith("distilroberta-base-rejection-v1")
+
+
+def test_disabled_guards_skip_llm_guard_import(monkeypatch):
+    monkeypatch.setattr(guard_manager, "HAS_LLM_GUARD", True)
+    monkeypatch.setattr(guard_manager, "_LLM_GUARD_LOADED", False)
+
+    def fail_load():
+        raise AssertionError("llm-guard should not be imported")
+
+    monkeypatch.setattr(guard_manager, "_load_llm_guard", fail_load)
+    manager = guard_manager.LLMGuardManager(enable_input=False, enable_output=False, lazy_init=False)
+    assert manager.input_scanners == []
+    assert manager.output_scanners == []
+
+
+def test_failed_llm_guard_import_disables_guards(monkeypatch):
+    monkeypatch.setattr(guard_manager, "HAS_LLM_GUARD", True)
+    monkeypatch.setattr(guard_manager, "_load_llm_guard", lambda: False)
+    manager = guard_manager.LLMGuardManager(enable_input=True, enable_output=True, lazy_init=False)
+    assert manager.enable_input is False
+    assert manager.enable_output is False
+
+
+def test_device_memory_stats_empty_on_cpu(monkeypatch):
+    monkeypatch.setenv("LLM_GUARD_DEVICE", "cpu")
+    manager = guard_manager.LLMGuardManager(enable_input=False, enable_output=False)
+    assert manager.get_device_memory_stats() == {}
@@ -15,8 +15,10 @@ class DummyConfig(dict):
 @pytest.fixture(autouse=True)
 def reset_http_client(monkeypatch):
     monkeypatch.setattr(http_client, "_HTTP_CLIENT", None)
+    monkeypatch.setattr(http_client, "_INFLIGHT_LIMITER", None)
     yield
     monkeypatch.setattr(http_client, "_HTTP_CLIENT", None)
+    monkeypatch.setattr(http_client, "_INFLIGHT_LIMITER", None)
 
 
 def test_env_helpers(monkeypatch):
@@ -121,14 +123,26 @@ async def test_close_http_client(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_safe_json_success_and_failure():
+async def test_inflight_limiter_respects_env(monkeypatch):
+    monkeypatch.setenv("MAX_INFLIGHT", "2")
+    limiter = http_client.get_inflight_limiter()
+    assert http_client.get_inflight_limiter() is limiter
+
+    await limiter.acquire()
+    await limiter.acquire()
+    assert limiter.locked() is True
+    limiter.release()
+    limiter.release()
+
+
+def test_safe_json_success_and_failure():
     ok = httpx.Response(200, content=b'{"foo": 1}')
-    data, err = await http_client.safe_json(ok)
+    data, err = http_client.safe_json(ok)
     assert data == {"foo": 1}
     assert err is None
 
     bad = httpx.Response(200, content=b"not json")
-    data, err = await http_client.safe_json(bad)
+    data, err = http_client.safe_json(bad)
     assert data is None
     assert "Expecting" in err
 
@@ -202,6 +216,56 @@ async def test_forward_request_post_and_stream(monkeypatch):
     assert isinstance(stream_ctx, DummyStream)
 
 
+@pytest.mark.asyncio
+async def test_forward_request_sends_raw_body(monkeypatch):
+    class DummyClient:
+        def __init__(self):
+            self.post_calls = []
+
+        async def post(self, url, **kwargs):
+            self.post_calls.append((url, kwargs))
+            return httpx.Response(200, request=httpx.Request("POST", url), json={})
+
+    dummy = DummyClient()
+    monkeypatch.setattr(http_client, "get_http_client", lambda max_pool=100: dummy)
+
+    raw = b'{"model": "phi"}'
+    resp, err = await http_client.forward_request(
+        DummyConfig({"ollama_url": "http://upstream"}),
+        "/api/show",
+        payload={"model": "phi"},
+        body=raw,
+    )
+
+    assert err is None
+    url, kwargs = dummy.post_calls[0]
+    assert url == "http://upstream/api/show"
+    assert kwargs["content"] is raw
+    assert kwargs["json"] is None
+    assert kwargs["headers"]["Content-Type"] == "application/json"
+
+
+@pytest.mark.asyncio
+async def test_read_json_body():
+    class DummyRequest:
+        url = SimpleNamespace(path="/api/show")
+
+        def __init__(self, body):
+            self._body = body
+
+        async def body(self):
+            return self._body
+
+    payload, body = await http_client.read_json_body(DummyRequest(b'{"model": "phi"}'))
+    assert payload == {"model": "phi"}
+    assert body == b'{"model": "phi"}'
+
+    with pytest.raises(http_client.HTTPException) as exc_info:
+        await http_client.read_json_body(DummyRequest(b"not json"))
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail["error"] == "invalid_json"
+
+
 @pytest.mark.asyncio
 async def test_forward_request_handles_http_error(monkeypatch):
     class ErrorClient:
@@ -215,4 +279,26 @@ async def test_forward_request_handles_http_error(monkeypatch):
         payload=None,
     )
     assert resp is None
-    assert "boom" in err
\ No newline at end of file
+    assert "boom" in err
+
+
+@pytest.mark.asyncio
+async def test_forward_request_reuses_timeout_objects(monkeypatch):
+    timeouts = []
+
+    class DummyClient:
+        async def get(self, url, headers=None, timeout=None):
+            timeouts.append(timeout)
+            return httpx.Response(200, request=httpx.Request("GET", url), json={})
+
+    monkeypatch.setattr(http_client, "get_http_client", lambda max_pool=100: DummyClient())
+    config = DummyConfig({"ollama_url": "http://upstream"})
+
+    await http_client.forward_request(config, "/api/tags", timeout=10)
+    await http_client.forward_request(config, "/api/tags", timeout=10)
+    await http_client.forward_request(config, "/api/tags")
+
+    assert timeouts[0] is timeouts[1]
+    assert timeouts[0] == httpx.Timeout(10)
+    assert timeouts[2] is http_client._DEFAULT_REQUEST_TIMEOUT
+    assert timeouts[2] == httpx.Timeout(300.0)
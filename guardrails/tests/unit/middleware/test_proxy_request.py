@@ -0,0 +1,44 @@
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+
+from ollama_guardrails.middleware.proxy_request import ProxyRequestMiddleware
+
+
+def _make_client(**kwargs):
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return PlainTextResponse("pong", headers={"Via": "1.1 nginx"})
+
+    @app.get("/health")
+    async def health():
+        return PlainTextResponse("healthy")
+
+    @app.get("/plain")
+    async def plain():
+        return PlainTextResponse("ok")
+
+    app.add_middleware(ProxyRequestMiddleware, **kwargs)
+    return TestClient(app)
+
+
+def test_via_header_added_and_appended():
+    client = _make_client()
+    assert client.get("/plain").headers["via"] == "1.1 Ollama-Guardrails/1.0"
+    assert client.get("/ping").headers["via"] == "1.1 nginx, Ollama-Guardrails/1.0"
+
+
+def test_access_log_reports_errors(caplog):
+    client = _make_client(enable_access_log=True)
+    with caplog.at_level("WARNING", logger="ollama_guardrails.middleware.proxy_request"):
+        assert client.get("/missing").status_code == 404
+    assert any("-> 404" in record.getMessage() for record in caplog.records)
+
+
+def test_health_probe_bypasses_middleware():
+    client = _make_client(enable_access_log=True)
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert "via" not in response.headers
@@ -0,0 +1,49 @@
+import importlib
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+# ``ollama_guardrails.app`` is shadowed by the FastAPI instance re-exported from the package
+app_module = importlib.import_module("ollama_guardrails.app")
+
+
+def test_resolve_workers_auto_uses_cpu_count(monkeypatch):
+    monkeypatch.setattr(app_module.os, "cpu_count", lambda: 6)
+    assert app_module._resolve_workers("auto") == 6
+    assert app_module._resolve_workers("AUTO") == 6
+
+
+@pytest.mark.parametrize("value, expected", [(4, 4), ("3", 3), (0, 1), (-2, 1)])
+def test_resolve_workers_accepts_ints(value, expected):
+    assert app_module._resolve_workers(value) == expected
+
+
+@pytest.mark.parametrize("value", ["many", None, [2]])
+def test_resolve_workers_falls_back_to_one_on_garbage(value, caplog):
+    with caplog.at_level("WARNING"):
+        assert app_module._resolve_workers(value) == 1
+    assert "Invalid workers setting" in caplog.text
+
+
+def test_select_server_impls_degrades_without_c_extensions(monkeypatch):
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: None)
+    assert app_module._select_server_impls() == ("asyncio", "h11")
+
+
+def test_select_server_impls_skips_uvloop_on_windows(monkeypatch):
+    monkeypatch.setattr(app_module.sys, "platform", "win32")
+    loop_impl, _ = app_module._select_server_impls()
+    assert loop_impl == "asyncio"
+
+
+def test_shipped_config_starts_single_worker(monkeypatch):
+    config_path = Path(__file__).resolve().parents[2] / "config" / "config.yaml"
+    monkeypatch.setenv("CONFIG_FILE", str(config_path))
+    monkeypatch.delenv("WORKERS", raising=False)
+    calls = []
+    monkeypatch.setattr(app_module.uvicorn, "run", lambda *args, **kwargs: calls.append(kwargs))
+
+    app_module.run_server()
+
+    assert calls[0]["workers"] == 1
@@ -0,0 +1,33 @@
+from pathlib import Path
+import sys
+
+REPO_ROOT = Path(__file__).resolve().parents[4]
+SRC_PATH = REPO_ROOT / "guardrails" / "src"
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+from ollama_guardrails.utils import concurrency_monitor
+from ollama_guardrails.utils.concurrency_monitor import ConcurrencyMonitor
+
+
+def test_fast_rss_bytes_falls_back_to_process(monkeypatch):
+    class DummyProcess:
+        def memory_info(self):
+            return type("MemInfo", (), {"rss": 1234})()
+
+    monkeypatch.setattr(concurrency_monitor, "_STATM_PATH", "/nonexistent/statm")
+    assert concurrency_monitor._fast_rss_bytes(DummyProcess()) == 1234
+    assert concurrency_monitor._fast_rss_bytes() is None
+
+
+def test_task_counters():
+    monitor = ConcurrencyMonitor(enable_debug=False)
+    monitor.increment_task("/api/chat")
+    monitor.increment_task("/api/chat")
+    monitor.decrement_task("/api/chat", success=False)
+
+    metrics = monitor.get_metrics()
+    assert metrics["current_active"] == 1
+    assert metrics["peak_concurrent"] == 2
+    assert metrics["failed_requests"] == 1
+    assert metrics["uptime_seconds"] >= 0
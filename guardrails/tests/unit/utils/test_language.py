@@ -6,7 +6,7 @@ SRC_PATH = REPO_ROOT / "guardrails" / "src"
 if str(SRC_PATH) not in sys.path:
     sys.path.insert(0, str(SRC_PATH))
 
-from ollama_guardrails.utils.language import LanguageDetector, get_language_message
+from ollama_guardrails.utils.language import LanguageDetector, _split_reason_templates, get_language_message
 
 
 def test_detect_language_uses_unicode_patterns():
@@ -29,4 +29,24 @@ def test_get_error_message_and_localized_message():
     message = LanguageDetector.get_error_message("prompt_blocked", "en", "unsafe")
     assert "unsafe" in message
     localized = get_language_message("你好", "server_busy")
-    assert localized
\ No newline at end of file
+    assert localized
+
+
+def test_get_error_message_reason_templates():
+    assert LanguageDetector.get_error_message("prompt_blocked", "xx", "bad") == \
+        LanguageDetector.ERROR_MESSAGES["en"]["prompt_blocked"].format(reason="bad")
+    assert LanguageDetector.get_error_message("prompt_blocked", "vi", "{x}").endswith("{x}")
+    assert LanguageDetector.get_error_message("server_error", "en", "ignored") == \
+        LanguageDetector.ERROR_MESSAGES["en"]["server_error"]
+
+
+def test_detect_language_keeps_script_priority():
+    # Cyrillic appears first, but Chinese has priority in LANGUAGE_PATTERNS
+    assert LanguageDetector.detect_language("Привет 你好") == "zh"
+    assert LanguageDetector.detect_language("Привет") == "ru"
+
+
+def test_split_reason_templates_handles_tables_without_reason():
+    assert _split_reason_templates({"en": {"server_error": "Internal error."}}) == {"en": {}}
+    assert _split_reason_templates({"en": {"blocked": "Blocked: {reason}!"}}) == {"en": {"blocked": ("Blocked: ", "!")}}
+    assert not hasattr(LanguageDetector, "_")
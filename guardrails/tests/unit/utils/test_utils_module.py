@@ -35,6 +35,17 @@ def test_combine_messages_text_filters_roles():
     assert latest == "second"
 
 
+def test_combine_messages_text_skips_blank_and_non_text_content():
+    messages = [
+        {"role": "user", "content": "keep"},
+        {"role": "user", "content": [{"type": "image"}]},
+        "not a message",
+        {"role": "user", "content": "  \n\t"},
+    ]
+    assert utils.combine_messages_text(messages) == "keep"
+    assert utils.combine_messages_text(messages, roles=("USER",), latest_only=True) == "keep"
+
+
 def test_build_ollama_options_merges_known_fields():
     payload = {
         "temperature": 0.2,
@@ -54,3 +65,13 @@ def test_extract_prompt_from_completion_payload_handles_list():
     assert utils.extract_prompt_from_completion_payload(payload) == "one\n2\nthree"
     payload = {"prompt": None}
     assert utils.extract_prompt_from_completion_payload(payload) == ""
+
+
+def test_new_completion_id_is_unique_and_openai_shaped():
+    first = utils.new_completion_id("chatcmpl")
+    second = utils.new_completion_id("chatcmpl")
+
+    assert first != second
+    assert first.startswith("chatcmpl-")
+    assert len(first.split("-", 1)[1]) == 32
+    int(first.split("-", 1)[1], 16)